@@ -0,0 +1,112 @@
+import pickle
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+User = get_user_model()
+
+PRINCIPAL_KEY = 'accounts:principal:{user_id}'
+PRINCIPAL_VERSION_KEY = 'accounts:principal:version:{user_id}'
+
+# user id -> (expiry on the monotonic clock, principal version, pickled user)
+_local = {}
+
+
+def query_principal(user_id):
+    return User.objects.select_related('profile').filter(**{api_settings.USER_ID_FIELD: user_id}).first()
+
+
+def load_principal(user_id):
+    """
+    Returns the user with its profile already joined. With a shared cache
+    (SHARED_CACHE) it comes from the in-process copy, then the shared
+    cache, then one query, but only under the user's current version,
+    which every lookup reads from the shared cache and any write to the
+    user or profile moves: a deactivation or password change reaches every
+    process on its next request. Without a shared cache each process could
+    only drop its own copies, so every lookup queries. Entries are stored
+    pickled so every request gets its own copy to mutate.
+    """
+    user_id = str(user_id)
+    if not settings.SHARED_CACHE:
+        return query_principal(user_id)
+
+    version_key = PRINCIPAL_VERSION_KEY.format(user_id=user_id)
+    key = PRINCIPAL_KEY.format(user_id=user_id)
+    found = cache.get_many([version_key, key])
+    version = found.get(version_key)
+    if version is None:
+        # Missing (never set, or evicted): start from the current time so
+        # entries stored under an older version can't match.
+        cache.add(version_key, time.time_ns(), None)
+        version = cache.get(version_key)
+
+    now = time.monotonic()
+    entry = _local.get(user_id)
+    if entry is not None and entry[0] > now and entry[1] == version:
+        return pickle.loads(entry[2])
+
+    shared = found.get(key)
+    if shared is not None and shared[0] == version:
+        data = shared[1]
+    else:
+        user = query_principal(user_id)
+        if user is None:
+            return None
+        data = pickle.dumps(user)
+        cache.set(key, (version, data), settings.PRINCIPAL_CACHE_TIMEOUT)
+
+    if len(_local) >= settings.PRINCIPAL_LOCAL_MAX_ENTRIES:
+        _local.clear()
+    _local[user_id] = (now + settings.PRINCIPAL_LOCAL_TIMEOUT, version, data)
+    return pickle.loads(data)
+
+
+def invalidate_principal(user_id):
+    """
+    Moves the user's principal version, so every process stops using its
+    cached copies on the next lookup.
+    """
+    user_id = str(user_id)
+    _local.pop(user_id, None)
+    if not settings.SHARED_CACHE:
+        return
+    version_key = PRINCIPAL_VERSION_KEY.format(user_id=user_id)
+    try:
+        cache.incr(version_key)
+    except ValueError:
+        cache.set(version_key, time.time_ns(), None)
+    cache.delete(PRINCIPAL_KEY.format(user_id=user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication whose user lookup also loads ``user.profile`` and is
+    served from ``load_principal``, so a cache hit costs no queries.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = load_principal(user_id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        return user
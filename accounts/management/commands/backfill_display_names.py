@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F, Q, Value
+from django.db.models.functions import Concat
+
+from accounts.models import Profile
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes Profile.display_name and Profile.username for profiles "
+        "whose stored copies differ from their user's."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Report drift without fixing it.")
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        drifted = Profile.objects.annotate(
+            actual_display_name=Concat('user__first_name', Value(' '), 'user__last_name'),
+            actual_username=F('user__username'),
+        ).exclude(
+            Q(display_name=F('actual_display_name')) & Q(username=F('actual_username')),
+        ).values_list('id', 'display_name', 'username', 'actual_display_name', 'actual_username')
+
+        batch = []
+        fixed = 0
+        for profile_id, display_name, username, actual_display_name, actual_username in drifted.iterator(
+            chunk_size=options['batch_size'],
+        ):
+            if options['verbosity'] > 1:
+                self.stdout.write(
+                    f"Profile {profile_id}: stored {display_name!r}/{username!r}, "
+                    f"actual {actual_display_name!r}/{actual_username!r}"
+                )
+            batch.append(Profile(id=profile_id, display_name=actual_display_name, username=actual_username))
+            if len(batch) >= options['batch_size']:
+                fixed += self.apply(batch, options['dry_run'])
+                batch = []
+        fixed += self.apply(batch, options['dry_run'])
+
+        verb = "would be fixed" if options['dry_run'] else "fixed"
+        self.stdout.write(self.style.SUCCESS(f"{fixed} profile(s) {verb}."))
+
+    def apply(self, batch, dry_run):
+        if not dry_run and batch:
+            with transaction.atomic():
+                Profile.objects.bulk_update(batch, ['display_name', 'username'])
+        return len(batch)
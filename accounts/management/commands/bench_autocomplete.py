@@ -0,0 +1,92 @@
+import random
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from accounts.models import Profile, get_display_name
+from accounts.views import ProfileAutocompleteView, ProfileListView
+from tasks.benchmarks import format_summary, get_bench_profile, measure
+
+User = get_user_model()
+
+FIRST_NAMES = [
+    'Aaron', 'Abigail', 'Adam', 'Alice', 'Amelia', 'Andrew', 'Anna', 'Benjamin',
+    'Charlotte', 'Chloe', 'Daniel', 'David', 'Elena', 'Emily', 'Ethan', 'Grace',
+    'Hannah', 'Isaac', 'Jack', 'James', 'Julia', 'Liam', 'Lucas', 'Maria',
+    'Mia', 'Noah', 'Olivia', 'Oscar', 'Priya', 'Rahul', 'Sofia', 'Zoe',
+]
+LAST_NAMES = [
+    'Anderson', 'Brown', 'Chen', 'Clark', 'Davis', 'Garcia', 'Gupta', 'Harris',
+    'Jackson', 'Johnson', 'Kim', 'Lee', 'Lopez', 'Martin', 'Miller', 'Moore',
+    'Nguyen', 'Patel', 'Robinson', 'Sharma', 'Singh', 'Smith', 'Taylor', 'Thomas',
+    'Walker', 'White', 'Williams', 'Wilson', 'Wright', 'Young',
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds users until --users exist and times the profile autocomplete "
+        "for short and long terms, and the first profile list page."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=500000)
+        parser.add_argument('--terms', default='a,al,ali,alice,smi,patel,jonhson',
+                            help="Comma-separated search terms.")
+        parser.add_argument('--repeat', type=int, default=50)
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        self.seed_users(options['users'], options['batch_size'])
+        user = get_bench_profile().user
+        factory = APIRequestFactory()
+        autocomplete = ProfileAutocompleteView.as_view()
+        profile_list = ProfileListView.as_view()
+
+        def get(view, path, params):
+            request = factory.get(path, params)
+            force_authenticate(request, user=user)
+            return view(request).render()
+
+        self.stdout.write(f"{Profile.objects.count()} profiles on {connection.vendor}")
+        cases = [
+            (f"autocomplete '{term}'", autocomplete, '/accounts/profiles/autocomplete/', {'q': term})
+            for term in options['terms'].split(',')
+        ]
+        cases.append(("profile list", profile_list, '/accounts/profiles/', {'page_size': 25}))
+
+        for label, view, path, params in cases:
+            with CaptureQueriesContext(connection) as queries:
+                response = get(view, path, params)
+            data = response.data
+            results = len(data['results'] if isinstance(data, dict) else data)
+            samples = measure(lambda: get(view, path, params), repeat=options['repeat'])
+            self.stdout.write(f"  {format_summary(label, samples)}, {results} results, {len(queries)} queries")
+
+    def seed_users(self, total, batch_size, seed=0):
+        existing = User.objects.count()
+        rng = random.Random(seed + existing)
+        while existing < total:
+            size = min(batch_size, total - existing)
+            with transaction.atomic():
+                users = User.objects.bulk_create([
+                    User(
+                        username=f'{first.lower()}.{last.lower()}{existing + i}',
+                        first_name=first,
+                        last_name=last,
+                        email=f'user{existing + i}@example.com',
+                        password='!',
+                    )
+                    for i, (first, last) in enumerate(
+                        (rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)) for _ in range(size)
+                    )
+                ])
+                Profile.objects.bulk_create([
+                    Profile(user=user, display_name=get_display_name(user), username=user.username)
+                    for user in users
+                ])
+            existing += size
+            self.stdout.write(f"  seeded {existing}/{total} users")
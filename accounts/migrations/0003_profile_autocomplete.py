@@ -0,0 +1,85 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:25
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Concat
+
+
+# The prefix indexes return name and username prefix matches in order: on
+# PostgreSQL over the upper-cased, "C"-collated value the view compares
+# with; on SQLite over NOCASE, which its case-insensitive LIKE can use. The
+# trigram GiST indexes serve word-similarity matches ordered by distance.
+CREATE_AUTOCOMPLETE_SQL = {
+    'postgresql': [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm;",
+        'CREATE INDEX profile_display_name_prefix_idx ON accounts_profile ((UPPER(display_name::text) COLLATE "C"), id);',
+        'CREATE INDEX profile_username_prefix_idx ON accounts_profile ((UPPER(username::text) COLLATE "C"), id);',
+        "CREATE INDEX profile_display_name_trgm_idx ON accounts_profile USING GIST (display_name gist_trgm_ops);",
+        "CREATE INDEX profile_username_trgm_idx ON accounts_profile USING GIST (username gist_trgm_ops);",
+    ],
+    'sqlite': [
+        "CREATE INDEX profile_display_name_prefix_idx ON accounts_profile (display_name COLLATE NOCASE);",
+        "CREATE INDEX profile_username_prefix_idx ON accounts_profile (username COLLATE NOCASE);",
+    ],
+}
+
+DROP_AUTOCOMPLETE_SQL = {
+    'postgresql': [
+        "DROP INDEX IF EXISTS profile_display_name_prefix_idx;",
+        "DROP INDEX IF EXISTS profile_username_prefix_idx;",
+        "DROP INDEX IF EXISTS profile_display_name_trgm_idx;",
+        "DROP INDEX IF EXISTS profile_username_trgm_idx;",
+    ],
+    'sqlite': [
+        "DROP INDEX IF EXISTS profile_display_name_prefix_idx;",
+        "DROP INDEX IF EXISTS profile_username_prefix_idx;",
+    ],
+}
+
+
+def backfill_names(apps, schema_editor):
+    Profile = apps.get_model('accounts', 'Profile')
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    users = User.objects.filter(pk=OuterRef('user_id'))
+    Profile.objects.update(
+        display_name=Subquery(users.annotate(name=Concat('first_name', Value(' '), 'last_name')).values('name')[:1]),
+        username=Subquery(users.values('username')[:1]),
+    )
+
+
+def create_autocomplete_indexes(apps, schema_editor):
+    for sql in CREATE_AUTOCOMPLETE_SQL.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+def drop_autocomplete_indexes(apps, schema_editor):
+    for sql in DROP_AUTOCOMPLETE_SQL.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_profile_phone_no'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='display_name',
+            field=models.CharField(blank=True, default='', max_length=301),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='username',
+            field=models.CharField(blank=True, default='', max_length=150),
+        ),
+        migrations.RunPython(backfill_names, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='profile',
+            index=models.Index(fields=['display_name', 'id'], name='profile_display_name_id_idx'),
+        ),
+        migrations.RunPython(create_autocomplete_indexes, drop_autocomplete_indexes),
+    ]
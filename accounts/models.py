@@ -5,6 +5,10 @@ from phonenumber_field.modelfields import PhoneNumberField
 
 User = get_user_model()
 
+
+def get_display_name(user):
+    return f"{user.first_name} {user.last_name}"
+
 class Profile(models.Model):
     user = models.OneToOneField(
         User,
@@ -13,9 +17,26 @@ class Profile(models.Model):
     )
     profile_pic = models.TextField(null=True, blank=True) # or avtar
     phone_no = PhoneNumberField(null=True, blank=True)
+    # Copies of the user's full name and username, so rendering and
+    # searching profiles don't need auth_user.
+    display_name = models.CharField(max_length=301, blank=True, default='')
+    username = models.CharField(max_length=150, blank=True, default='')
+    
+    class Meta:
+        indexes = [
+            # Keyset pagination of the profile list. The autocomplete
+            # indexes are database-specific; see migration 0005.
+            models.Index(fields=['display_name', 'id'], name='profile_display_name_id_idx'),
+        ]
+    
+    def save(self, *args, **kwargs):
+        if self._state.adding:
+            self.display_name = self.display_name or get_display_name(self.user)
+            self.username = self.username or self.user.username
+        super().save(*args, **kwargs)
     
     def get_full_name(self):
-        return f"{self.user.first_name} {self.user.last_name}"
+        return self.display_name
     
     def __str__(self):
         full_name = self.get_full_name().strip()
@@ -1,6 +1,6 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from accounts.models import Profile
+from accounts.models import Profile, get_display_name
 from accounts.validators import strong_password_validator
 from phonenumber_field.serializerfields import PhoneNumberField
 from drf_spectacular.utils import extend_schema_field
@@ -113,6 +113,7 @@ class ProfileSerializer(serializers.ModelSerializer):
                 setattr(user, attr, value)
             
             user.save()
+            instance.display_name = get_display_name(user)
         
         instance.save()
         return instance
@@ -122,11 +123,16 @@ class ProfileListSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Profile
-        fields = ['id', 'full_name', 'profile_pic']
+        fields = ['id', 'full_name']
 
     @extend_schema_field(OpenApiTypes.STR)
     def get_full_name(self, obj):
-        return obj.get_full_name()
+        return obj.display_name
+
+class ProfileAutocompleteSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    full_name = serializers.CharField(source='display_name')
+    username = serializers.CharField()
 
 class EmptySerializer(serializers.Serializer):
     pass
@@ -0,0 +1,35 @@
+from functools import partial
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from accounts.authentication import invalidate_principal
+from accounts.models import Profile, get_display_name
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_principal(sender, instance, **kwargs):
+    # After the commit, so a concurrent request can't cache the old row again.
+    transaction.on_commit(partial(invalidate_principal, instance.pk))
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def invalidate_profile_principal(sender, instance, **kwargs):
+    transaction.on_commit(partial(invalidate_principal, instance.user_id))
+
+
+@receiver(post_save, sender=User)
+def sync_profile_names(sender, instance, created, update_fields=None, **kwargs):
+    # Keeps the profile's copies in step with edits made outside ProfileSerializer.
+    if created or (update_fields is not None and not {'username', 'first_name', 'last_name'} & set(update_fields)):
+        return
+    display_name = get_display_name(instance)
+    Profile.objects.filter(user_id=instance.pk).exclude(
+        username=instance.username, display_name=display_name,
+    ).update(username=instance.username, display_name=display_name)
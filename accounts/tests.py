@@ -1,3 +1,148 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from . import throttling
+from .authentication import PRINCIPAL_KEY, PRINCIPAL_VERSION_KEY
+from .models import Profile
+from .views import ProfileAutocompleteView
+
+User = get_user_model()
+
+
+class ThrottleTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        throttling._backends.clear()
+
+    def reset(self, email, ip='10.0.0.1'):
+        response = self.client.post(
+            reverse('password-reset-request'), {'email': email}, format='json', REMOTE_ADDR=ip,
+        )
+        return response.status_code != status.HTTP_429_TOO_MANY_REQUESTS
+
+    def assert_limits(self):
+        # password_reset.email is 3/hour and password_reset.ip 10/hour.
+        self.assertEqual([self.reset('victim@example.com') for _ in range(4)], [True] * 3 + [False])
+        # Another address from the same client still has its own bucket...
+        self.assertTrue(self.reset('other@example.com'))
+        # ...until the client runs out.
+        self.assertEqual([self.reset(f'user{index}@example.com') for index in range(6)], [True] * 5 + [False])
+        self.assertTrue(self.reset('fresh@example.com', ip='10.0.0.2'))
+
+    def test_cache_buckets(self):
+        self.assert_limits()
+
+    @override_settings(THROTTLE_BACKEND='accounts.throttling.LocalBucketBackend')
+    def test_local_buckets(self):
+        self.assert_limits()
+
+    def test_forwarded_for_is_not_trusted_by_default(self):
+        for index in range(10):
+            self.client.post(
+                reverse('password-reset-request'), {'email': f'user{index}@example.com'}, format='json',
+                REMOTE_ADDR='10.0.0.1', HTTP_X_FORWARDED_FOR=f'192.0.2.{index}',
+            )
+        self.assertFalse(self.reset('fresh@example.com'))
+
+    def test_retry_after(self):
+        for _ in range(3):
+            self.reset('victim@example.com')
+        response = self.client.post(reverse('password-reset-request'), {'email': 'victim@example.com'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertGreater(int(response['Retry-After']), 0)
+
+
+@override_settings(SHARED_CACHE=True)
+class PrincipalCacheTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('member', 'member@example.com', 'Secret123')
+        Profile.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+
+    def test_saving_the_user_drops_the_cached_principal(self):
+        self.assertEqual(self.client.get(reverse('my-profile')).status_code, status.HTTP_200_OK)
+        self.assertIsNotNone(cache.get(PRINCIPAL_KEY.format(user_id=self.user.id)))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            user = User.objects.get(id=self.user.id)
+            user.is_active = False
+            user.save()
+        self.assertIsNone(cache.get(PRINCIPAL_KEY.format(user_id=self.user.id)))
+        self.assertEqual(self.client.get(reverse('my-profile')).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_saving_the_profile_drops_the_cached_principal(self):
+        self.client.get(reverse('my-profile'))
+        with self.captureOnCommitCallbacks(execute=True):
+            Profile.objects.get(user=self.user).save()
+        self.assertIsNone(cache.get(PRINCIPAL_KEY.format(user_id=self.user.id)))
+
+    def test_another_process_invalidating_drops_the_local_copy(self):
+        self.assertEqual(self.client.get(reverse('my-profile')).status_code, status.HTTP_200_OK)
+        # Another process deactivates the user: only the shared version moves,
+        # this process's copy is still in place.
+        User.objects.filter(id=self.user.id).update(is_active=False)
+        cache.incr(PRINCIPAL_VERSION_KEY.format(user_id=self.user.id))
+        self.assertEqual(self.client.get(reverse('my-profile')).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(SHARED_CACHE=False)
+    def test_no_shared_cache_reads_every_request(self):
+        self.assertEqual(self.client.get(reverse('my-profile')).status_code, status.HTTP_200_OK)
+        self.assertIsNone(cache.get(PRINCIPAL_KEY.format(user_id=self.user.id)))
+        User.objects.filter(id=self.user.id).update(is_active=False)
+        self.assertEqual(self.client.get(reverse('my-profile')).status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+@override_settings(REPLICA_VIEWS=[])
+class ProfileSearchTests(APITestCase):
+
+    def setUp(self):
+        self.user = self.make_user('viewer', 'Vera', 'Viewer')
+        self.client.force_authenticate(self.user)
+
+    def make_user(self, username, first_name, last_name):
+        user = User.objects.create_user(username, first_name=first_name, last_name=last_name)
+        Profile.objects.create(user=user)
+        return user
+
+    def autocomplete(self, term):
+        response = self.client.get(reverse('profile-autocomplete'), {'q': term})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [profile['username'] for profile in response.data]
+
+    def test_prefixes_match_by_name_then_username(self):
+        self.make_user('zed', 'Alice', 'Smith')
+        self.make_user('alfred', 'Bob', 'Jones')
+        self.make_user('carol', 'Carol', 'Alder')
+        self.assertEqual(self.autocomplete('al'), ['zed', 'alfred'])
+
+    # Prefix lookups only, without trigram matches topping up the results.
+    @mock.patch.object(ProfileAutocompleteView, 'trigram_min_length', 100)
+    def test_non_ascii_prefixes(self):
+        self.make_user('gross', 'Straße', 'Groß')
+        self.make_user('ozil', 'Özil', 'Mesut')
+        self.assertEqual(self.autocomplete('straß'), ['gross'])
+        self.assertEqual(self.autocomplete('STRASSE'), [])
+        self.assertEqual(self.autocomplete('Öz'), ['ozil'])
+
+    def test_user_edits_reach_the_profile(self):
+        user = self.make_user('old.name', 'Old', 'Name')
+        user.username = 'new.name'
+        user.first_name = 'New'
+        user.save()
+        profile = Profile.objects.get(user=user)
+        self.assertEqual((profile.username, profile.display_name), ('new.name', 'New Name'))
+        self.assertEqual(self.autocomplete('new'), ['new.name'])
+
+    def test_list_leaves_out_profile_pictures(self):
+        response = self.client.get(reverse('profile-list'))
+        self.assertEqual(list(response.data['results'][0]), ['id', 'full_name'])
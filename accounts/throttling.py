@@ -0,0 +1,156 @@
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+from rest_framework.exceptions import ParseError
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+DURATIONS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+
+
+def parse_rate(rate):
+    """'5/min' -> (5, 60): a bucket of 5 tokens refilled over 60 seconds."""
+    num, period = rate.split('/')
+    return int(num), DURATIONS[period[0]]
+
+
+class LocalBucketBackend:
+    """
+    Exact token buckets in process memory. Only correct with a single
+    process, so meant for tests and development.
+    """
+    max_entries = 10000
+
+    def __init__(self):
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def consume(self, key, capacity, period):
+        refill = capacity / period
+        with self.lock:
+            now = time.monotonic()
+            tokens, updated = self.buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * refill)
+
+            if len(self.buckets) >= self.max_entries:
+                self.buckets.clear()
+            if tokens >= 1:
+                self.buckets[key] = (tokens - 1, now)
+                return True, 0
+            self.buckets[key] = (tokens, now)
+            return False, (1 - tokens) / refill
+
+
+class CacheBucketBackend:
+    """
+    Approximates the token bucket with a sliding window over two atomic
+    ``incr`` counters in the shared cache: at most ``capacity`` requests
+    in any ``period``, weighting the previous window by how much of it
+    still overlaps. Rejected requests count too, so a client that keeps
+    hammering stays limited.
+    """
+    key_format = 'throttle:{key}:{window}'
+
+    def consume(self, key, capacity, period):
+        now = time.time()
+        window = int(now // period)
+        current = self.key_format.format(key=key, window=window)
+
+        cache.add(current, 0, period * 2)
+        try:
+            count = cache.incr(current)
+        except ValueError:
+            cache.set(current, 1, period * 2)
+            count = 1
+        previous = cache.get(self.key_format.format(key=key, window=window - 1), 0)
+
+        remaining = 1 - (now % period) / period
+        estimated = previous * remaining + count
+        if estimated <= capacity:
+            return True, 0
+
+        wait = period * remaining
+        if previous and count <= capacity:
+            wait = min(wait, (estimated - capacity) / previous * period)
+        return False, wait
+
+
+_backends = {}
+
+
+def get_backend():
+    path = settings.THROTTLE_BACKEND
+    if path not in _backends:
+        _backends[path] = import_string(path)()
+    return _backends[path]
+
+
+class BucketThrottle(BaseThrottle):
+    """
+    Looks up ``<view.throttle_scope>.<name>`` in DEFAULT_THROTTLE_RATES and
+    takes one token from the bucket of every identity ``get_idents``
+    returns, by default just the client address. Views without a scope, or
+    scopes without a rate, aren't throttled.
+    """
+    name = 'ip'
+
+    def get_idents(self, request, view):
+        return [self.get_ident(request)]
+
+    def allow_request(self, request, view):
+        scope = getattr(view, 'throttle_scope', None)
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(f'{scope}.{self.name}') if scope else None
+        if rate is None:
+            return True
+
+        capacity, period = parse_rate(rate)
+        backend = get_backend()
+        self.wait_seconds = 0
+        allowed = True
+        for ident in self.get_idents(request, view):
+            digest = hashlib.sha256(ident.encode()).hexdigest()[:32]
+            ok, wait = backend.consume(f'{scope}:{self.name}:{digest}', capacity, period)
+            if not ok:
+                allowed = False
+                self.wait_seconds = max(self.wait_seconds, wait)
+        return allowed
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class IPBucketThrottle(BucketThrottle):
+    """One bucket per client address (REMOTE_ADDR, or X-Forwarded-For per NUM_PROXIES)."""
+
+
+class FieldBucketThrottle(BucketThrottle):
+    """One bucket per value of each field in ``view.throttle_fields``, e.g. the email."""
+    name = 'field'
+
+    def allow_request(self, request, view):
+        self.wait_seconds = 0
+        allowed = True
+        for field in getattr(view, 'throttle_fields', ()):
+            throttle = FieldThrottle(field)
+            if not throttle.allow_request(request, view):
+                allowed = False
+                self.wait_seconds = max(self.wait_seconds, throttle.wait())
+        return allowed
+
+
+class FieldThrottle(BucketThrottle):
+    def __init__(self, field):
+        self.name = field
+
+    def get_idents(self, request, view):
+        try:
+            value = request.data.get(self.name)
+        except (ParseError, AttributeError):
+            return []
+        if not isinstance(value, str) or not value.strip():
+            return []
+        return [value.strip().lower()]
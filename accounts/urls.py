@@ -1,17 +1,21 @@
 from django.urls import path, include
 
+from task_management.async_views import list_view, with_async_reads
+
 from accounts.views import (
     ActivateUserView,
     PasswordResetRequestView,
     PasswordResetVerifyView,
     ProfileListView,
+    ProfileAutocompleteView,
     MyProfileView,
 )
 
-urlpatterns = [
+urlpatterns = with_async_reads([
     path('activate/<str:token>/', ActivateUserView.as_view(), name='activate-user'),
     path('password-reset/request/', PasswordResetRequestView.as_view(), name='password-reset-request'),
     path('password-reset/verify/', PasswordResetVerifyView.as_view(), name='password-reset-verify'),
     path('profiles/', ProfileListView.as_view(), name='profile-list'),
+    path('profiles/autocomplete/', ProfileAutocompleteView.as_view(), name='profile-autocomplete'),
     path('profiles/me/', MyProfileView.as_view(), name='my-profile'),
-]
\ No newline at end of file
+], {'profile-list': list_view})
\ No newline at end of file
@@ -1,5 +1,5 @@
-from django.core.mail import send_mail
 from django.conf import settings
+from jobs.outbox import queue_email
 
 import jwt
 from cryptography.fernet import Fernet
@@ -34,10 +34,9 @@ def verify_token(encrypted_token):
     except Exception:
         return False, None
 
-def send_welcome_email(user, request):
+def send_welcome_email(user, host):
     token = create_verification_token(user.id, user.email)
     
-    host = request.get_host()
     verification_url = f"http://{host}/accounts/activate/{token}/"
     
     subject = "Verify Your Email Address"
@@ -49,7 +48,7 @@ def send_welcome_email(user, request):
         "Best Regards,\nYour Team"
     )
     
-    send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, [user.email], fail_silently=False)
+    queue_email(subject, message, [user.email])
 
 def generate_otp(length=6):
     return ''.join(random.choices(string.digits, k=length))
@@ -88,4 +87,4 @@ def send_otp_email(email, otp):
         "If you didn't request this, please ignore this email.\n\n"
         "Best Regards,\nYour Team"
     )
-    send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, [email], fail_silently=False)
\ No newline at end of file
+    queue_email(subject, message, [email])
\ No newline at end of file
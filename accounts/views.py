@@ -1,3 +1,5 @@
+from functools import partial
+
 from rest_framework import viewsets, permissions, status, views
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -9,6 +11,7 @@ from accounts.serializers import (
     PasswordResetRequestSerializer, 
     PasswordResetVerifySerializer,
     ProfileListSerializer,
+    ProfileAutocompleteSerializer,
 )
 
 from accounts.serializers import (
@@ -16,26 +19,39 @@ from accounts.serializers import (
     PasswordResetResponseSerializer,
 )
 from .utils import (
-    send_welcome_email,
     verify_token,
     generate_otp,
     create_reset_token,
-    send_otp_email,
     verify_reset_token,
+    send_otp_email,
+    send_welcome_email,
 )
-from django.db import transaction
+from django.conf import settings
+from django.db import connection, transaction
+from django.contrib.postgres.search import TrigramWordDistance
+from django.db.models import TextField
+from django.db.models.functions import Cast, Collate, Upper
+from tasks.pagination import KeysetPagination
+from .throttling import FieldBucketThrottle, IPBucketThrottle
+from rest_framework_simplejwt.views import TokenObtainPairView
 
 
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from accounts.serializers import RegisterSerializer
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from drf_spectacular.types import OpenApiTypes
 
 User = get_user_model()
 
 class RegisterView(generics.CreateAPIView):
     serializer_class = RegisterSerializer
+    # No authentication, so throttling is decided before any token is decoded.
+    authentication_classes = []
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [IPBucketThrottle, FieldBucketThrottle]
+    throttle_scope = 'register'
+    throttle_fields = ['email']
     
     def create(self, request):
         with transaction.atomic():
@@ -43,15 +59,8 @@ class RegisterView(generics.CreateAPIView):
             serializer.is_valid(raise_exception=True)
             profile = serializer.save()
             
-            try:
-                send_welcome_email(profile.user, request)
-
-            except Exception as e:
-                transaction.set_rollback(True)
-                return Response(
-                    {"status": "FAILED", "error": "Error sending email"}, 
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                )
+            # Queued in the outbox with the signup, so both commit or neither does.
+            send_welcome_email(profile.user, request.get_host())
         
             data = {
                 "profile": {
@@ -103,7 +112,11 @@ class ActivateUserView(views.APIView):
         
             
 class PasswordResetRequestView(views.APIView):
+    authentication_classes = []
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [IPBucketThrottle, FieldBucketThrottle]
+    throttle_scope = 'password_reset'
+    throttle_fields = ['email']
 
     @extend_schema(
         description="Requests a password reset OTP sent via email",
@@ -196,10 +209,96 @@ class PasswordResetVerifyView(views.APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
 
+class TokenObtainView(TokenObtainPairView):
+    throttle_classes = [IPBucketThrottle, FieldBucketThrottle]
+    throttle_scope = 'token'
+    throttle_fields = ['username']
+
+
 class ProfileListView(generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = ProfileListSerializer
     queryset = Profile.objects.filter(user__is_active=True)
+    ordering_fields = ["display_name"]
+    ordering = ["display_name"]
+    pagination_class = KeysetPagination
+
+
+class ProfileAutocompleteView(views.APIView):
+    """
+    Active profiles whose name, then username, starts with ``q``; on
+    PostgreSQL, trigram word matches (inner words, typos) fill up the rest
+    once ``q`` has three characters. Every lookup walks an index in order
+    and stops at the limit, so the cost doesn't grow with the match count.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    search_fields = ('display_name', 'username')
+    trigram_min_length = 3
+    
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(name='q', type=OpenApiTypes.STR, required=True),
+            OpenApiParameter(
+                name='limit',
+                type=OpenApiTypes.INT,
+                default=settings.PROFILE_AUTOCOMPLETE_LIMIT,
+                description=f"At most {settings.PROFILE_AUTOCOMPLETE_MAX_LIMIT}",
+            ),
+        ],
+        responses={200: ProfileAutocompleteSerializer(many=True)},
+    )
+    def get(self, request):
+        term = request.query_params.get('q', '').strip()
+        if not term:
+            return Response([])
+        
+        try:
+            limit = int(request.query_params['limit'])
+        except (KeyError, ValueError):
+            limit = settings.PROFILE_AUTOCOMPLETE_LIMIT
+        if limit <= 0:
+            limit = settings.PROFILE_AUTOCOMPLETE_LIMIT
+        limit = min(limit, settings.PROFILE_AUTOCOMPLETE_MAX_LIMIT)
+        
+        return Response(ProfileAutocompleteSerializer(self.search(term, limit), many=True).data)
+    
+    def search(self, term, limit):
+        profiles = Profile.objects.filter(user__is_active=True).values('id', 'display_name', 'username')
+        lookups = [partial(self.prefix_matches, profiles, field, term) for field in self.search_fields]
+        if connection.vendor == 'postgresql' and len(term) >= self.trigram_min_length:
+            lookups += [partial(self.trigram_matches, profiles, field, term) for field in self.search_fields]
+        
+        rows = {}
+        for lookup in lookups:
+            if len(rows) >= limit:
+                break
+            for row in lookup(limit):
+                rows.setdefault(row['id'], row)
+        return list(rows.values())[:limit]
+    
+    def prefix_matches(self, profiles, field, term, limit):
+        if connection.vendor != 'postgresql':
+            # Case-insensitive LIKE walks the NOCASE index on SQLite.
+            return profiles.filter(**{f'{field}__istartswith': term}).order_by(Collate(field, 'nocase'), 'id')[:limit]
+        
+        profiles = profiles.alias(key=Collate(Upper(Cast(field, TextField())), 'C'))
+        if not term.isascii():
+            # Python and PostgreSQL upper-case some letters differently
+            # ("ß"), so let the database compare. Still ordered, not ranged.
+            return profiles.filter(**{f'{field}__istartswith': term}).order_by('key', 'id')[:limit]
+        
+        # A range over the "C"-collated, upper-cased name is exactly the
+        # prefix match, and its expression index returns rows in order.
+        prefix = term.upper()
+        profiles = profiles.filter(key__gte=prefix, key__lt=prefix[:-1] + chr(ord(prefix[-1]) + 1))
+        return profiles.order_by('key', 'id')[:limit]
+    
+    def trigram_matches(self, profiles, field, term, limit):
+        # Distance only: the GiST index can't order by a tiebreaker, and one
+        # would sort every equally close match (all the "Smith"s) first.
+        return profiles.filter(**{f'{field}__trigram_word_similar': term}).order_by(
+            TrigramWordDistance(term, field),
+        )[:limit]
 
 
 class MyProfileView(generics.RetrieveUpdateDestroyAPIView):
@@ -207,8 +306,9 @@ class MyProfileView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = ProfileSerializer
     
     def get_object(self):
-        return self.request.user.profile
-        
+        # request.user.profile may come from the principal cache; edit a fresh copy.
+        return Profile.objects.select_related('user').get(user_id=self.request.user.id)
+    
     def destroy(self, request, *args, **kwargs):
         profile = self.get_object()
         user = profile.user
@@ -5,4 +5,5 @@ echo "Migrating..."
 pipenv run python manage.py migrate
 
 echo "Starting Server..."
-pipenv run python manage.py runserver 0.0.0.0:8000
\ No newline at end of file
+# Persistent connections leak under ASGI (one per request thread); pool instead.
+ASYNC_READ_VIEWS=1 DB_CONN_MAX_AGE=0 DB_POOL=1 pipenv run uvicorn task_management.asgi:application --reload --host 0.0.0.0 --port 8000
\ No newline at end of file
@@ -0,0 +1,54 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from jobs.outbox import OutboxSender, purge_sent, queue_email, requeue_stale
+
+
+class Command(BaseCommand):
+    help = (
+        "Delivers queued outbox emails in batches over one reused mail "
+        "connection and reports throughput. Sent emails are deleted after "
+        "EMAIL_OUTBOX_KEEP_SENT seconds. Runs until interrupted unless "
+        "--once is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, help="Emails claimed per batch (EMAIL_OUTBOX_BATCH_SIZE).")
+        parser.add_argument('--rate', type=float, help="Max emails per second, 0 for no limit (EMAIL_OUTBOX_RATE).")
+        parser.add_argument('--backend', help="Email backend to send with instead of EMAIL_BACKEND, "
+                                              "e.g. django.core.mail.backends.locmem.EmailBackend.")
+        parser.add_argument('--sleep', type=float, default=5.0, help="Seconds to wait when the outbox is empty.")
+        parser.add_argument('--once', action='store_true', help="Drain the outbox and exit.")
+        parser.add_argument('--seed', type=int, default=0,
+                            help="Queue this many test emails first, to measure throughput.")
+        parser.add_argument('--seed-to', default='outbox-test@example.com')
+
+    def handle(self, *args, **options):
+        for i in range(options['seed']):
+            queue_email(f"Outbox test {i}", "Outbox throughput test.", [options['seed_to']])
+
+        try:
+            while True:
+                close_old_connections()
+                requeue_stale()
+                purge_sent()
+                sender = OutboxSender(options['batch_size'], options['rate'], options['backend'])
+                stats = sender.drain()
+                if stats['batches']:
+                    self.report(stats)
+                elif options['once']:
+                    self.stdout.write("Nothing to send")
+                if options['once']:
+                    break
+                time.sleep(options['sleep'])
+        except KeyboardInterrupt:
+            pass
+
+    def report(self, stats):
+        self.stdout.write(
+            f"Sent {stats['sent']} in {stats['elapsed']:.2f}s ({stats['per_second']:.1f}/s) "
+            f"over {stats['batches']} batch(es) and {stats['connections']} connection(s); "
+            f"{stats['retried']} to retry, {stats['failed']} failed"
+        )
@@ -0,0 +1,162 @@
+import datetime
+import logging
+import time
+
+from cryptography.fernet import Fernet, InvalidToken
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from jobs.models import OutgoingEmail
+
+logger = logging.getLogger(__name__)
+
+# Bodies carry verification links and reset codes, so they are stored
+# encrypted and cleared once the message is sent.
+fernet = Fernet(settings.ENCRYPTION_KEY)
+
+
+def queue_email(subject, body, to, from_email=None):
+    """Adds a message to the outbox; ``send_outbox`` delivers it."""
+    return OutgoingEmail.objects.create(
+        subject=subject,
+        body=fernet.encrypt(body.encode()).decode(),
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL or '',
+        to=list(to),
+    )
+
+
+def requeue_stale():
+    """
+    Returns emails left sending by a sender that died to the outbox, or
+    marks them failed once they have used up EMAIL_OUTBOX_MAX_ATTEMPTS.
+    """
+    now = timezone.now()
+    stale = OutgoingEmail.objects.filter(
+        status=OutgoingEmail.STATUS_SENDING,
+        locked_at__lt=now - datetime.timedelta(seconds=settings.EMAIL_OUTBOX_LOCK_TIMEOUT),
+    )
+    stale.filter(attempts__gte=settings.EMAIL_OUTBOX_MAX_ATTEMPTS).update(
+        status=OutgoingEmail.STATUS_FAILED, locked_at=None,
+        last_error="The sender stopped while sending this email.",
+    )
+    return stale.update(status=OutgoingEmail.STATUS_PENDING, locked_at=None)
+
+
+def purge_sent():
+    """Deletes emails sent more than EMAIL_OUTBOX_KEEP_SENT seconds ago."""
+    cutoff = timezone.now() - datetime.timedelta(seconds=settings.EMAIL_OUTBOX_KEEP_SENT)
+    deleted, _ = OutgoingEmail.objects.filter(status=OutgoingEmail.STATUS_SENT, sent_at__lt=cutoff).delete()
+    return deleted
+
+
+def get_backoff(attempts):
+    """Seconds to wait before retrying an email that has failed ``attempts`` times."""
+    return min(settings.EMAIL_OUTBOX_BACKOFF_BASE * 2 ** (attempts - 1), settings.EMAIL_OUTBOX_BACKOFF_MAX)
+
+
+def claim(limit):
+    """
+    Locks up to ``limit`` due emails for this sender. Rows locked by another
+    sender are skipped rather than waited on.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            OutgoingEmail.objects.select_for_update(skip_locked=True)
+            .filter(status=OutgoingEmail.STATUS_PENDING, send_after__lte=now)
+            .order_by('send_after', 'id')
+            .values_list('id', flat=True)[:limit]
+        )
+        OutgoingEmail.objects.filter(id__in=ids, status=OutgoingEmail.STATUS_PENDING).update(
+            status=OutgoingEmail.STATUS_SENDING, locked_at=now, attempts=F('attempts') + 1,
+        )
+    return list(
+        OutgoingEmail.objects.filter(id__in=ids, status=OutgoingEmail.STATUS_SENDING, locked_at=now)
+        .order_by('send_after', 'id')
+    )
+
+
+class OutboxSender:
+    """
+    Drains the outbox in batches over one mail connection, opened on the
+    first message and reused until the outbox is empty. ``rate`` caps
+    messages per second across batches (0 for no limit).
+    """
+
+    def __init__(self, batch_size=None, rate=None, backend=None):
+        self.batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+        self.rate = settings.EMAIL_OUTBOX_RATE if rate is None else rate
+        self.connection = get_connection(backend, fail_silently=False)
+        self.stats = {'sent': 0, 'retried': 0, 'failed': 0, 'batches': 0, 'connections': 0}
+
+    def open(self):
+        # open() returns True only when it created a new connection.
+        if self.connection.open():
+            self.stats['connections'] += 1
+
+    def close(self):
+        try:
+            self.connection.close()
+        except Exception:
+            logger.exception("Error closing the mail connection")
+
+    def drain(self, max_batches=None):
+        """Sends batches until the outbox has nothing due. Returns the stats."""
+        start = time.perf_counter()
+        try:
+            while max_batches is None or self.stats['batches'] < max_batches:
+                emails = claim(self.batch_size)
+                if not emails:
+                    break
+                self.stats['batches'] += 1
+                for email in emails:
+                    self.throttle(start)
+                    self.send(email)
+        finally:
+            self.close()
+
+        self.stats['elapsed'] = time.perf_counter() - start
+        self.stats['per_second'] = self.stats['sent'] / self.stats['elapsed'] if self.stats['elapsed'] else 0
+        return self.stats
+
+    def throttle(self, start):
+        if not self.rate:
+            return
+        done = self.stats['sent'] + self.stats['retried'] + self.stats['failed']
+        wait = start + done / self.rate - time.perf_counter()
+        if wait > 0:
+            time.sleep(wait)
+
+    def send(self, email):
+        try:
+            # A body that no longer decrypts (say, ENCRYPTION_KEY was rotated)
+            # fails this email only, not the rest of the batch.
+            body = fernet.decrypt(email.body.encode()).decode()
+            message = EmailMessage(email.subject, body, email.from_email or None, email.to)
+            self.open()
+            self.connection.send_messages([message])
+        except Exception as exc:
+            if not isinstance(exc, InvalidToken):
+                # Drop a possibly broken connection; the next message reopens it.
+                self.close()
+            email.last_error = f"{type(exc).__name__}: {exc}"
+            if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+                email.status = OutgoingEmail.STATUS_FAILED
+                self.stats['failed'] += 1
+                logger.error("Giving up on email %s after %s attempt(s)", email.pk, email.attempts)
+            else:
+                email.status = OutgoingEmail.STATUS_PENDING
+                email.send_after = timezone.now() + datetime.timedelta(seconds=get_backoff(email.attempts))
+                self.stats['retried'] += 1
+        else:
+            email.status = OutgoingEmail.STATUS_SENT
+            email.sent_at = timezone.now()
+            email.body = ''
+            email.last_error = ''
+            self.stats['sent'] += 1
+
+        email.locked_at = None
+        email.save(update_fields=['status', 'send_after', 'locked_at', 'sent_at', 'body', 'last_error'])
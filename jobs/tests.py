@@ -0,0 +1,147 @@
+import datetime
+
+from cryptography.fernet import Fernet
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts import throttling
+from jobs.models import OutgoingEmail
+from jobs.outbox import OutboxSender, purge_sent, queue_email, requeue_stale
+
+User = get_user_model()
+
+LOCMEM_EMAIL = 'django.core.mail.backends.locmem.EmailBackend'
+
+
+class FailingBackend:
+    """Mail backend that refuses every message."""
+
+    def __init__(self, **kwargs):
+        pass
+
+    def open(self):
+        return True
+
+    def close(self):
+        pass
+
+    def send_messages(self, messages):
+        raise ConnectionError("SMTP is down")
+
+
+class OutboxTests(TestCase):
+
+    def drain(self, backend=LOCMEM_EMAIL):
+        return OutboxSender(batch_size=2, rate=0, backend=backend).drain()
+
+    def test_drains_in_batches(self):
+        for index in range(5):
+            queue_email(f"Subject {index}", "Body", [f'user{index}@example.com'])
+
+        stats = self.drain()
+        self.assertEqual((stats['sent'], stats['batches']), (5, 3))
+        self.assertEqual([message.subject for message in mail.outbox], [f"Subject {index}" for index in range(5)])
+        self.assertFalse(OutgoingEmail.objects.exclude(status=OutgoingEmail.STATUS_SENT).exists())
+
+    def test_failed_send_is_retried_later(self):
+        email = queue_email("Subject", "Body", ['user@example.com'])
+
+        stats = self.drain(backend=f'{__name__}.FailingBackend')
+        self.assertEqual(stats['retried'], 1)
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), (OutgoingEmail.STATUS_PENDING, 1))
+        self.assertIn("SMTP is down", email.last_error)
+        # Backed off, so a second pass has nothing due.
+        self.assertEqual(self.drain()['sent'], 0)
+
+    @override_settings(EMAIL_OUTBOX_MAX_ATTEMPTS=1)
+    def test_gives_up_after_max_attempts(self):
+        email = queue_email("Subject", "Body", ['user@example.com'])
+        self.drain(backend=f'{__name__}.FailingBackend')
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutgoingEmail.STATUS_FAILED)
+
+    @override_settings(EMAIL_OUTBOX_MAX_ATTEMPTS=2, EMAIL_OUTBOX_LOCK_TIMEOUT=60)
+    def test_stale_sends_are_retried_until_out_of_attempts(self):
+        emails = [queue_email(f"Subject {index}", "Body", ['user@example.com']) for index in range(2)]
+        OutgoingEmail.objects.filter(id=emails[1].id).update(attempts=1)
+        OutgoingEmail.objects.update(
+            status=OutgoingEmail.STATUS_SENDING, locked_at=timezone.now() - datetime.timedelta(minutes=5),
+        )
+        # A sender that dies mid-send has still used the attempt.
+        OutgoingEmail.objects.filter(id=emails[1].id).update(attempts=2)
+
+        self.assertEqual(requeue_stale(), 1)
+        self.assertEqual(
+            list(OutgoingEmail.objects.order_by('id').values_list('status', flat=True)),
+            [OutgoingEmail.STATUS_PENDING, OutgoingEmail.STATUS_FAILED],
+        )
+
+    def test_body_is_encrypted_until_sent(self):
+        email = queue_email("Subject", "Your code is 123456", ['user@example.com'])
+        email.refresh_from_db()
+        self.assertNotIn("123456", email.body)
+
+        self.drain()
+        self.assertEqual(mail.outbox[0].body, "Your code is 123456")
+        email.refresh_from_db()
+        self.assertEqual(email.body, '')
+
+    def test_purges_old_sent_emails(self):
+        old, recent, pending = (queue_email(f"Subject {index}", "Body", ['user@example.com']) for index in range(3))
+        OutgoingEmail.objects.filter(id=old.id).update(
+            status=OutgoingEmail.STATUS_SENT, sent_at=timezone.now() - datetime.timedelta(days=8),
+        )
+        OutgoingEmail.objects.filter(id=recent.id).update(status=OutgoingEmail.STATUS_SENT, sent_at=timezone.now())
+
+        self.assertEqual(purge_sent(), 1)
+        self.assertQuerySetEqual(OutgoingEmail.objects.order_by('id'), [recent, pending])
+
+    def test_undecryptable_body_fails_that_email_only(self):
+        broken, fine = (queue_email(f"Subject {index}", "Body", ['user@example.com']) for index in range(2))
+        # As if ENCRYPTION_KEY had been rotated since it was queued.
+        OutgoingEmail.objects.filter(id=broken.id).update(
+            body=Fernet(Fernet.generate_key()).encrypt(b"Body").decode(),
+        )
+
+        stats = self.drain()
+        self.assertEqual((stats['sent'], stats['retried']), (1, 1))
+        self.assertEqual([message.subject for message in mail.outbox], ["Subject 1"])
+        broken.refresh_from_db()
+        self.assertEqual((broken.status, broken.locked_at), (OutgoingEmail.STATUS_PENDING, None))
+        self.assertIn("InvalidToken", broken.last_error)
+
+
+class SignupEmailTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        throttling._backends.clear()
+
+    def test_register_writes_the_outbox_directly(self):
+        response = self.client.post(reverse('register'), {
+            'username': 'newcomer',
+            'email': 'newcomer@example.com',
+            'password': 'Secret123',
+            'password_confirm': 'Secret123',
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        email = OutgoingEmail.objects.get()
+        self.assertEqual(email.to, ['newcomer@example.com'])
+
+        OutboxSender(rate=0, backend=LOCMEM_EMAIL).drain()
+        self.assertIn("/accounts/activate/", mail.outbox[0].body)
+
+    def test_password_reset_writes_the_outbox_directly(self):
+        User.objects.create_user('member', 'member@example.com', 'Secret123')
+        response = self.client.post(reverse('password-reset-request'), {'email': 'member@example.com'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(OutgoingEmail.objects.get().to, ['member@example.com'])
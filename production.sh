@@ -1,3 +1,6 @@
+# More than one worker needs REDIS_URL; settings refuse to start without it.
+export WEB_CONCURRENCY=${WEB_CONCURRENCY:-4}
+
 echo "Creating migrations..."
 pipenv run python manage.py makemigrations
 
@@ -8,4 +11,11 @@ echo "Collecting static files..."
 pipenv run python manage.py collectstatic --noinput
 
 echo "Starting Server..."
-pipenv run gunicorn document_archvie.wsgi:application --bind 0.0.0.0:8000
\ No newline at end of file
+# SERVER_MODE=wsgi keeps the previous sync gunicorn workers, e.g. for load test comparisons.
+if [ "${SERVER_MODE:-asgi}" = "wsgi" ]; then
+    pipenv run gunicorn task_management.wsgi:application --workers $WEB_CONCURRENCY --bind 0.0.0.0:8000
+else
+    # Persistent connections leak under ASGI (one per request thread); pool instead.
+    ASYNC_READ_VIEWS=1 DB_CONN_MAX_AGE=0 DB_POOL=1 pipenv run gunicorn task_management.asgi:application \
+        --worker-class uvicorn_worker.UvicornWorker --workers $WEB_CONCURRENCY --bind 0.0.0.0:8000
+fi
\ No newline at end of file
@@ -10,7 +10,11 @@ https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
 import os
 
 from django.core.asgi import get_asgi_application
+from dotenv import load_dotenv, find_dotenv
 
+# Servers import this module directly, not through manage.py, so they read
+# .env here.
+load_dotenv(find_dotenv())
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'task_management.settings')
 
 application = get_asgi_application()
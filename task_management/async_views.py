@@ -0,0 +1,89 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.urls import URLPattern
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.response import Response
+
+
+def async_read(fallback, handler):
+    """
+    Wraps the DRF view ``fallback`` (anything returned by ``as_view()``) so
+    that GET and HEAD are served by the coroutine ``handler(view, request,
+    *args, **kwargs)``. Every other method still goes to ``fallback``.
+
+    Authentication, permissions, throttling and content negotiation run
+    through the view's own ``initial()``, and exceptions and rendering
+    through ``handle_exception()``/``finalize_response()``, so responses
+    match the sync view.
+    """
+    sync_fallback = sync_to_async(fallback)
+    actions = getattr(fallback, 'actions', None)
+
+    @csrf_exempt
+    async def view(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return await sync_fallback(request, *args, **kwargs)
+
+        self = fallback.cls(**fallback.initkwargs)
+        if actions:
+            self.action_map = {**actions, 'head': actions['get']}
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            response = await handler(self, request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    # Same introspection attributes as the DRF view it stands in for.
+    view.cls = fallback.cls
+    view.initkwargs = fallback.initkwargs
+    view.actions = actions
+    return view
+
+
+def with_async_reads(patterns, handlers):
+    """
+    Swaps in ``async_read`` views for the patterns named in ``handlers``
+    when ASYNC_READ_VIEWS is on; returns ``patterns`` untouched otherwise.
+    """
+    if not getattr(settings, 'ASYNC_READ_VIEWS', False):
+        return patterns
+
+    return [
+        URLPattern(pattern.pattern, async_read(pattern.callback, handlers[pattern.name]),
+                   pattern.default_args, pattern.name)
+        if isinstance(pattern, URLPattern) and pattern.name in handlers else pattern
+        for pattern in patterns
+    ]
+
+
+async def afilter_queryset(view):
+    # Filter backends may validate against the database (e.g. ModelChoiceFilter).
+    return await sync_to_async(lambda: view.filter_queryset(view.get_queryset()))()
+
+
+async def apaginate_queryset(view, queryset):
+    if view.paginator is None:
+        return None
+    return await view.paginator.apaginate_queryset(queryset, view.request, view=view)
+
+
+async def list_view(view, request, *args, **kwargs):
+    """Async ``ListModelMixin.list``."""
+    queryset = await afilter_queryset(view)
+
+    page = await apaginate_queryset(view, queryset)
+    if page is not None:
+        serializer = view.get_serializer(page, many=True)
+        return view.get_paginated_response(serializer.data)
+
+    serializer = view.get_serializer([obj async for obj in queryset], many=True)
+    return Response(serializer.data)
@@ -0,0 +1,69 @@
+"""
+Database profiles for ``settings.DATABASES``.
+
+``postgres`` is the deployment profile: persistent connections with health
+checks, or psycopg 3's connection pool, or settings that suit an external
+PgBouncer. ``sqlite`` is a tuned single-file stand-in so the project,
+its benchmarks and load tests run on one box without a database server.
+"""
+
+# Applied to every new SQLite connection. WAL lets readers run alongside the
+# single writer; synchronous=NORMAL is durable across app crashes in WAL mode
+# (only an OS crash can lose the last commits); mmap and a larger page cache
+# keep hot pages out of read() calls.
+SQLITE_PRAGMAS = [
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA mmap_size=268435456',
+    'PRAGMA cache_size=-65536',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA foreign_keys=ON',
+]
+
+
+def postgres_database(name, user, password, host, port, conn_max_age=60,
+                      pool=False, pool_min_size=2, pool_max_size=10, pgbouncer=False):
+    """
+    ``pool`` uses Django's built-in pool (psycopg 3 only), which replaces
+    persistent connections. ``pgbouncer`` is for transaction-pooling
+    PgBouncer: server-side cursors don't survive across its transactions,
+    so ``.iterator()`` (and with it the task export) then loads the whole
+    result client-side.
+    """
+    database = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': name,
+        'USER': user,
+        'PASSWORD': password,
+        'HOST': host,
+        'PORT': port,
+        'CONN_MAX_AGE': conn_max_age,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {},
+    }
+    if pool:
+        database['CONN_MAX_AGE'] = 0
+        database['OPTIONS']['pool'] = {
+            'min_size': pool_min_size,
+            'max_size': pool_max_size,
+            'timeout': 10,
+        }
+    if pgbouncer:
+        database['DISABLE_SERVER_SIDE_CURSORS'] = True
+    return database
+
+
+def sqlite_database(path, conn_max_age=60):
+    return {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': path,
+        'CONN_MAX_AGE': conn_max_age,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'init_command': ';'.join(SQLITE_PRAGMAS),
+            # Take the write lock at BEGIN so concurrent writers wait on
+            # the busy timeout instead of failing mid-transaction.
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 20,
+        },
+    }
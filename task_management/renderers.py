@@ -0,0 +1,72 @@
+from django.conf import settings
+from phonenumber_field.phonenumber import PhoneNumber
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JSONEncoder(encoders.JSONEncoder):
+    """DRF's encoder, plus phone numbers rendered the way PhoneNumberField does."""
+
+    def default(self, obj):
+        if isinstance(obj, PhoneNumber):
+            return str(obj)
+        return super().default(obj)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    Encodes with orjson when it is installed and the output format allows it
+    (compact, non-ASCII-escaped, unindented). Dates, datetimes and any other
+    type orjson doesn't handle natively go through ``JSONEncoder.default``,
+    so both paths produce the same bytes.
+    """
+    encoder_class = JSONEncoder
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        indent = self.get_indent(accepted_media_type, renderer_context)
+        if orjson is None or indent is not None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=_encoder.default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class FastJSONParser(JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+
+        try:
+            data = stream.read()
+            if encoding.lower().replace('-', '') != 'utf8':
+                data = data.decode(encoding)
+            return orjson.loads(data)
+        except ValueError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
+
+
+_encoder = JSONEncoder()
+_renderer = FastJSONRenderer()
+
+
+def dumps(data):
+    return _renderer.render(data)
@@ -0,0 +1,111 @@
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.utils.deprecation import MiddlewareMixin
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
+
+REPLICA_ALIAS = 'replica'
+PIN_KEY = 'replica:pin:{user_id}'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Whether reads in the current request may go to the replica.
+replica_reads = ContextVar('replica_reads', default=False)
+
+
+class ReplicaRouter:
+    """Sends reads to the replica while ``replica_reads`` is set; writes always go to the primary."""
+
+    def db_for_read(self, model, **hints):
+        if replica_reads.get() and REPLICA_ALIAS in connections.databases:
+            return REPLICA_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data.
+        return True
+
+
+def get_token_user_id(request):
+    """The user id claim of a valid bearer token, without touching the database."""
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = authentication.get_raw_token(header) if header else None
+    if raw_token is None:
+        return None
+    try:
+        token = authentication.get_validated_token(raw_token)
+    except (InvalidToken, TokenError):
+        return None
+    return token.get(api_settings.USER_ID_CLAIM)
+
+
+def iter_on_replica(content):
+    # Streaming responses run their queries after the middleware returns.
+    iterator = iter(content)
+    while True:
+        replica_reads.set(True)
+        try:
+            chunk = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            replica_reads.set(False)
+        yield chunk
+
+
+async def aiter_on_replica(content):
+    iterator = aiter(content)
+    while True:
+        replica_reads.set(True)
+        try:
+            chunk = await anext(iterator)
+        except StopAsyncIteration:
+            return
+        finally:
+            replica_reads.set(False)
+        yield chunk
+
+
+class ReplicaMiddleware(MiddlewareMixin):
+    """
+    Routes safe requests to the views in REPLICA_VIEWS to the replica,
+    unless the user wrote something in the last REPLICA_PIN_SECONDS: any
+    successful unsafe request pins its user to the primary for that long,
+    so they read their own writes.
+    """
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        replica_reads.set(False)
+        if REPLICA_ALIAS not in connections.databases:
+            return None
+
+        request.token_user_id = get_token_user_id(request)
+        if request.method not in SAFE_METHODS:
+            return None
+
+        view_class = getattr(view_func, 'cls', None)
+        if view_class is None or f'{view_class.__module__}.{view_class.__qualname__}' not in settings.REPLICA_VIEWS:
+            return None
+        if request.token_user_id is not None and cache.get(PIN_KEY.format(user_id=request.token_user_id)):
+            return None
+
+        replica_reads.set(True)
+        return None
+
+    def process_response(self, request, response):
+        if replica_reads.get() and response.streaming:
+            wrap = aiter_on_replica if getattr(response, 'is_async', False) else iter_on_replica
+            response.streaming_content = wrap(response.streaming_content)
+        replica_reads.set(False)
+
+        user_id = getattr(request, 'token_user_id', None)
+        if user_id is not None and request.method not in SAFE_METHODS and response.status_code < 400:
+            cache.set(PIN_KEY.format(user_id=user_id), True, settings.REPLICA_PIN_SECONDS)
+        return response
@@ -13,6 +13,10 @@ import os
 from pathlib import Path
 from datetime import timedelta
 
+from django.core.exceptions import ImproperlyConfigured
+
+from task_management.db import postgres_database, sqlite_database
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -42,11 +46,41 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.DjangoModelPermissionsOrAnonReadOnly',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    # orjson-backed when it is installed, stdlib json otherwise.
+    'DEFAULT_RENDERER_CLASSES': [
+        'task_management.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'task_management.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    # Token buckets for the unauthenticated auth endpoints, per
+    # "<throttle_scope>.ip" and "<throttle_scope>.<throttle field>".
+    'DEFAULT_THROTTLE_RATES': {
+        'register.ip': '10/hour',
+        'register.email': '3/hour',
+        'password_reset.ip': '10/hour',
+        'password_reset.email': '3/hour',
+        'token.ip': '30/min',
+        'token.username': '10/min',
+    },
+    # Throttles key on REMOTE_ADDR unless the app runs behind that many
+    # proxies; only then is X-Forwarded-For trusted, and only the address
+    # the last proxy saw.
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', 0)),
 }
 
+# Counters for accounts.throttling: the shared cache, so limits hold across
+# workers. accounts.throttling.LocalBucketBackend keeps them in process.
+# Without REDIS_URL the "shared" cache is per-process local memory too, and
+# every worker enforces its own limits: set REDIS_URL in production.
+THROTTLE_BACKEND = 'accounts.throttling.CacheBucketBackend'
+
 INSTALLED_APPS = [
     'django.contrib.admin',
     'django.contrib.auth',
@@ -54,12 +88,14 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'corsheaders',
     'rest_framework',
     'rest_framework_simplejwt',
     'phonenumber_field',
     'accounts',
     'tasks',
+    'jobs',
     'drf_spectacular',
 ]
 
@@ -70,6 +106,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'task_management.replicas.ReplicaMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -97,6 +134,11 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'task_management.wsgi.application'
+ASGI_APPLICATION = 'task_management.asgi.application'
+
+# Serve the read-heavy GET endpoints (task list/detail, comment list,
+# profile list) with async views. Only worth it under an ASGI server.
+ASYNC_READ_VIEWS = os.getenv('ASYNC_READ_VIEWS') == '1'
 
 
 # Database
@@ -117,18 +159,87 @@ DB_IS_AVAIL = all([
     DB_PORT,
 ])
 
-if DB_IS_AVAIL and DB_IS_READY:
+# DB_PROFILE picks task_management.db.postgres_database or sqlite_database;
+# by default Postgres when it is configured and ready, SQLite when it isn't
+# configured at all. A configured Postgres that isn't ready is an error
+# rather than a silent switch to db.sqlite3.
+DB_PROFILE = os.getenv('DB_PROFILE')
+
+# psycopg's connection pool. On by default with ASYNC_READ_VIEWS: async views
+# run their queries on threads, and persistent connections would pile up one
+# per thread, so the ASGI scripts also set DB_CONN_MAX_AGE=0.
+DB_POOL = os.getenv('DB_POOL', '1' if ASYNC_READ_VIEWS else '0') == '1'
+
+if not DB_PROFILE:
+    if DB_IS_AVAIL and not DB_IS_READY:
+        raise ImproperlyConfigured(
+            "POSTGRES_* is set but POSTGRES_READY isn't 1. "
+            "Set POSTGRES_READY=1, or DB_PROFILE=sqlite to run on SQLite anyway."
+        )
+    DB_PROFILE = 'postgres' if DB_IS_AVAIL else 'sqlite'
+
+if DB_PROFILE == 'postgres':
     DATABASES = {
-        'default': {
-            'ENGINE': 'django.db.backends.postgresql',
-            'NAME': DB_NAME,
-            'USER': DB_USERNAME,
-            'PASSWORD': DB_PASSWORD,
-            'HOST': DB_HOST,
-            'PORT': DB_PORT,
-        }
+        'default': postgres_database(
+            name=DB_NAME,
+            user=DB_USERNAME,
+            password=DB_PASSWORD,
+            host=DB_HOST,
+            port=DB_PORT,
+            conn_max_age=int(os.getenv('DB_CONN_MAX_AGE', 60)),
+            pool=DB_POOL,
+            pool_min_size=int(os.getenv('DB_POOL_MIN_SIZE', 2)),
+            pool_max_size=int(os.getenv('DB_POOL_MAX_SIZE', 10)),
+            pgbouncer=os.getenv('DB_PGBOUNCER') == '1',
+        )
+    }
+else:
+    DATABASES = {
+        'default': sqlite_database(
+            os.getenv('SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+            conn_max_age=int(os.getenv('DB_CONN_MAX_AGE', 60)),
+        )
     }
 
+# Optional read replica, used by task_management.replicas for safe requests
+# to REPLICA_VIEWS. For local testing, SQLITE_REPLICA_PATH adds a second
+# SQLite file that sync_sqlite_replica copies the primary into.
+POSTGRES_REPLICA_HOST = os.getenv('POSTGRES_REPLICA_HOST')
+SQLITE_REPLICA_PATH = os.getenv('SQLITE_REPLICA_PATH')
+
+if DB_PROFILE == 'postgres' and POSTGRES_REPLICA_HOST:
+    DATABASES['replica'] = postgres_database(
+        name=DB_NAME,
+        user=os.getenv('POSTGRES_REPLICA_USER', DB_USERNAME),
+        password=os.getenv('POSTGRES_REPLICA_PASSWORD', DB_PASSWORD),
+        host=POSTGRES_REPLICA_HOST,
+        port=os.getenv('POSTGRES_REPLICA_PORT', DB_PORT),
+        conn_max_age=int(os.getenv('DB_CONN_MAX_AGE', 60)),
+        pool=DB_POOL,
+    )
+elif DB_PROFILE == 'sqlite' and SQLITE_REPLICA_PATH:
+    DATABASES['replica'] = sqlite_database(
+        SQLITE_REPLICA_PATH,
+        conn_max_age=int(os.getenv('DB_CONN_MAX_AGE', 60)),
+    )
+
+if 'replica' in DATABASES:
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+
+DATABASE_ROUTERS = ['task_management.replicas.ReplicaRouter']
+
+REPLICA_VIEWS = [
+    'tasks.views.TaskViewSet',
+    'tasks.views.CommentViewSet',
+    'tasks.views.StatusViewSet',
+    'tasks.views.ProjectViewSet',
+    'accounts.views.ProfileListView',
+    'accounts.views.ProfileAutocompleteView',
+]
+# Seconds a user reads from the primary after a successful write; also how
+# long after a write responses read from the replica aren't cached.
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', 5))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -178,14 +289,92 @@ INTERNAL_IPS = [
 ]
 
 #Email Backend
-EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
-EMAIL_HOST = "smtp.gmail.com"
-EMAIL_PORT = 587
-EMAIL_USE_TLS = True
+EMAIL_BACKEND = os.getenv('EMAIL_BACKEND', "django.core.mail.backends.smtp.EmailBackend")
+EMAIL_HOST = os.getenv('EMAIL_HOST', "smtp.gmail.com")
+EMAIL_PORT = int(os.getenv('EMAIL_PORT', 587))
+EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS', '1') == '1'
 EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD')
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 
+# Outgoing mail is written to the outbox and delivered by send_outbox over
+# one reused connection: EMAIL_OUTBOX_BATCH_SIZE emails claimed at a time, at
+# most EMAIL_OUTBOX_RATE per second (0 for no limit). Failed sends are retried
+# after EMAIL_OUTBOX_BACKOFF_BASE * 2**(attempt - 1) seconds, capped at
+# EMAIL_OUTBOX_BACKOFF_MAX, and marked failed after EMAIL_OUTBOX_MAX_ATTEMPTS.
+# Emails left sending by a sender that went away are picked up again after
+# EMAIL_OUTBOX_LOCK_TIMEOUT seconds. Bodies are encrypted with ENCRYPTION_KEY
+# and cleared once sent; sent rows are deleted after EMAIL_OUTBOX_KEEP_SENT
+# seconds.
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv('EMAIL_OUTBOX_BATCH_SIZE', 50))
+EMAIL_OUTBOX_RATE = float(os.getenv('EMAIL_OUTBOX_RATE', 10))
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_BACKOFF_BASE = 30
+EMAIL_OUTBOX_BACKOFF_MAX = 60 * 60
+EMAIL_OUTBOX_LOCK_TIMEOUT = 10 * 60
+EMAIL_OUTBOX_KEEP_SENT = 7 * 24 * 60 * 60
+
+# Cache
+# Local memory per process by default; set REDIS_URL to share it between workers.
+REDIS_URL = os.getenv('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Whether the default cache is shared by every process. The task response
+# cache and the principal cache are only correct when it is: with
+# per-process local memory a write in one worker never invalidates another's
+# entries, so without it neither is used.
+SHARED_CACHE = bool(REDIS_URL)
+
+# Server worker processes (production.sh exports it). Several workers on
+# per-process caches would each serve their own stale entries.
+WEB_CONCURRENCY = int(os.getenv('WEB_CONCURRENCY', 1))
+
+if WEB_CONCURRENCY > 1 and not SHARED_CACHE:
+    raise ImproperlyConfigured(
+        f"WEB_CONCURRENCY is {WEB_CONCURRENCY} but REDIS_URL isn't set. "
+        "Set REDIS_URL so the workers share one cache, or run one worker."
+    )
+
+TASK_CACHE_ALIAS = 'default'
+TASK_CACHE_TIMEOUT = int(os.getenv('TASK_CACHE_TIMEOUT', 300))
+
+# Seconds a process keeps its status map before reloading it, even when the
+# STATUS_SCOPE version hasn't moved (it can't be seen moving from another
+# process without SHARED_CACHE).
+STATUS_MAP_TIMEOUT = int(os.getenv('STATUS_MAP_TIMEOUT', 30))
+
+# With SHARED_CACHE, authenticated users (with their profile) are cached per
+# process for PRINCIPAL_LOCAL_TIMEOUT seconds and in the shared cache for
+# PRINCIPAL_CACHE_TIMEOUT seconds, both checked against a per-user version in
+# the shared cache on every request.
+PRINCIPAL_CACHE_TIMEOUT = 60
+PRINCIPAL_LOCAL_TIMEOUT = 5
+PRINCIPAL_LOCAL_MAX_ENTRIES = 10000
+
+# Number of latest comments embedded in task detail responses.
+TASK_DETAIL_COMMENTS = 20
+
+# Tasks per column returned by the task board, by default and at most.
+TASK_BOARD_PER_COLUMN = 20
+TASK_BOARD_MAX_PER_COLUMN = 100
+
+# Results returned by the profile autocomplete, by default and at most.
+PROFILE_AUTOCOMPLETE_LIMIT = 10
+PROFILE_AUTOCOMPLETE_MAX_LIMIT = 25
+
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_CREDENTIALS = True
 
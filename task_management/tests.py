@@ -0,0 +1,44 @@
+import datetime
+import decimal
+import uuid
+from io import BytesIO
+from unittest import skipIf
+
+from django.test import SimpleTestCase
+from phonenumber_field.phonenumber import PhoneNumber
+from rest_framework.renderers import JSONRenderer
+
+from .renderers import FastJSONParser, FastJSONRenderer, orjson
+
+
+@skipIf(orjson is None, "orjson is not installed")
+class FastJSONRendererTests(SimpleTestCase):
+
+    def assert_same_bytes(self, data):
+        renderer = FastJSONRenderer()
+        self.assertEqual(renderer.render(data), JSONRenderer.render(renderer, data))
+
+    def test_matches_stdlib_json(self):
+        self.assert_same_bytes({
+            'date': datetime.date(2026, 3, 1),
+            'datetime': datetime.datetime(2026, 3, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+            'offset': datetime.datetime(
+                2026, 3, 1, 12, 30, tzinfo=datetime.timezone(datetime.timedelta(hours=5, minutes=30)),
+            ),
+            'naive': datetime.datetime(2026, 3, 1, 12, 30),
+            'time': datetime.time(9, 5, 1, 500),
+            'phone': PhoneNumber.from_string('+14155552671'),
+            'decimal': decimal.Decimal('1.50'),
+            'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'text': 'Café “quoted” \u2028line\u2029separators',
+            'nested': [{'id': 1, 'due_date': None, 'done': True, 'ratio': 0.5}],
+        })
+
+    def test_phone_numbers_render_as_e164(self):
+        data = {'phone_number': PhoneNumber.from_string('+14155552671')}
+        self.assertEqual(FastJSONRenderer().render(data), b'{"phone_number":"+14155552671"}')
+
+    def test_parser_reads_what_the_renderer_writes(self):
+        data = {'title': 'Café', 'assignees': [1, 2], 'due_date': None}
+        parsed = FastJSONParser().parse(BytesIO(FastJSONRenderer().render(data)))
+        self.assertEqual(parsed, data)
@@ -10,7 +10,11 @@ https://docs.djangoproject.com/en/5.1/howto/deployment/wsgi/
 import os
 
 from django.core.wsgi import get_wsgi_application
+from dotenv import load_dotenv, find_dotenv
 
+# Servers import this module directly, not through manage.py, so they read
+# .env here.
+load_dotenv(find_dotenv())
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'task_management.settings')
 
 application = get_wsgi_application()
@@ -0,0 +1,61 @@
+from functools import partial
+
+from django.http import Http404
+from rest_framework.response import Response
+
+from task_management.async_views import afilter_queryset, apaginate_queryset, list_view
+from tasks import cache, conditional
+from tasks.models import Task
+from tasks.readers import arender_task_list, task_list_values
+from tasks.statuses import aget_statuses
+
+
+async def task_list(view, request, *args, **kwargs):
+    """Async ``TaskViewSet.list``."""
+    project_id = kwargs.get('project_pk')
+    scopes = cache.list_scopes(project_id)
+    key = await cache.amake_key('list', request, scopes, project=project_id)
+    return await conditional.arespond(
+        request, key, await conditional.aget_key_validators(key, scopes), partial(fast_list, view),
+    )
+
+
+async def fast_list(view):
+    queryset = task_list_values(await afilter_queryset(view))
+
+    page = await apaginate_queryset(view, queryset)
+    if page is not None:
+        return view.get_paginated_response(await arender_task_list(page))
+    return Response(await arender_task_list([row async for row in queryset]))
+
+
+async def task_detail(view, request, *args, **kwargs):
+    """Async ``TaskViewSet.retrieve``."""
+    task_id = kwargs['pk']
+    project_id = kwargs.get('project_pk')
+    scopes = cache.detail_scopes(task_id)
+    queryset = (await afilter_queryset(view)).filter(pk=task_id)
+    validators = await conditional.aget_validators(request, queryset, scopes, task=task_id, project=project_id)
+    key = await cache.amake_key('detail', request, scopes, task=task_id, project=project_id)
+    return await conditional.arespond(request, key, validators, partial(render_task, view, queryset))
+
+
+async def render_task(view, queryset):
+    try:
+        task = await queryset.aget()
+    except Task.DoesNotExist:
+        raise Http404
+    view.check_object_permissions(view.request, task)
+    # Load the status map here; the serializer can't query from async code.
+    context = {**view.get_serializer_context(), 'statuses': await aget_statuses([task.status_id])}
+    return Response(view.get_serializer(task, context=context).data)
+
+
+READ_HANDLERS = {
+    'task-list': task_list,
+    'task-detail': task_detail,
+    'project-tasks-list': task_list,
+    'project-tasks-detail': task_detail,
+    'task-comments-list': list_view,
+    'standalone-task-comments-list': list_view,
+}
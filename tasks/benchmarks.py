@@ -0,0 +1,113 @@
+import datetime
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from accounts.models import Profile
+from tasks.models import Project, Status, Task
+
+User = get_user_model()
+
+WORDS = [
+    'api', 'backend', 'billing', 'board', 'bug', 'cache', 'client', 'deploy',
+    'design', 'docs', 'email', 'export', 'frontend', 'import', 'invoice',
+    'login', 'migration', 'mobile', 'onboarding', 'payment', 'performance',
+    'release', 'report', 'review', 'search', 'security', 'signup', 'sprint',
+    'test', 'upload',
+]
+
+
+def get_bench_profile(username='bench'):
+    user, _ = User.objects.get_or_create(
+        username=username,
+        defaults={'email': f'{username}@example.com', 'first_name': username.title(), 'last_name': 'User'},
+    )
+    profile, _ = Profile.objects.get_or_create(user=user)
+    return profile
+
+
+def get_bench_fixtures(profile, statuses=6, projects=20, assignees=50):
+    status_ids = [
+        Status.objects.get_or_create(name=f'bench-{i}', defaults={'created_by': profile})[0].id
+        for i in range(statuses)
+    ]
+    project_ids = list(Project.objects.filter(name__startswith='bench-').values_list('id', flat=True))
+    for i in range(len(project_ids), projects):
+        project_ids.append(Project.objects.create(name=f'bench-{i}', created_by=profile).id)
+    profile_ids = [get_bench_profile(f'bench{i}').id for i in range(assignees)]
+    return status_ids, project_ids, profile_ids
+
+
+def random_text(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+def seed_tasks(total, batch_size=5000, seed=0, stdout=None):
+    """Creates tasks until at least ``total`` exist and returns the count."""
+    existing = Task.objects.count()
+    if existing >= total:
+        return existing
+
+    rng = random.Random(seed + existing)
+    profile = get_bench_profile()
+    status_ids, project_ids, profile_ids = get_bench_fixtures(profile)
+    priorities = list(Task.PRIORITY_CHOICES)
+    today = datetime.date.today()
+    Through = Task.assignees.through
+
+    while existing < total:
+        size = min(batch_size, total - existing)
+        with transaction.atomic():
+            tasks = Task.objects.bulk_create([
+                Task(
+                    title=random_text(rng, 4),
+                    description=random_text(rng, 30),
+                    priority=rng.choice(priorities),
+                    status_id=rng.choice(status_ids),
+                    project_id=rng.choice(project_ids),
+                    due_date=today + datetime.timedelta(days=rng.randint(-60, 120)) if rng.random() < 0.7 else None,
+                    created_by=profile,
+                )
+                for _ in range(size)
+            ])
+            Through.objects.bulk_create([
+                Through(task_id=task.id, profile_id=profile_id)
+                for task in tasks
+                for profile_id in rng.sample(profile_ids, rng.randint(0, 3))
+            ])
+        existing += size
+        if stdout is not None:
+            stdout.write(f"  seeded {existing}/{total} tasks")
+    return existing
+
+
+def measure(fn, repeat=20, warmup=2):
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    return {
+        'p50_ms': statistics.median(ordered) * 1000,
+        'p95_ms': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        'mean_ms': statistics.fmean(ordered) * 1000,
+    }
+
+
+def format_summary(label, samples):
+    stats = summarize(samples)
+    return (
+        f"{label}: p50 {stats['p50_ms']:.2f} ms, "
+        f"p95 {stats['p95_ms']:.2f} ms, mean {stats['mean_ms']:.2f} ms"
+    )
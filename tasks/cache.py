@@ -0,0 +1,270 @@
+import hashlib
+import json
+import time
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections, transaction
+from rest_framework.response import Response
+
+from task_management.replicas import REPLICA_ALIAS, replica_reads
+
+VERSION_KEY = 'tasks:version:{scope}'
+MODIFIED_KEY = 'tasks:modified:{scope}'
+RECENT_KEY = 'tasks:recent:{scope}'
+RESPONSE_KEY = 'tasks:response:{kind}:{digest}'
+STATS_KEY = 'tasks:cache:{outcome}'
+
+LIST_SCOPE = 'list'
+STATUS_SCOPE = 'status'
+PROFILES_SCOPE = 'profiles'
+
+
+def get_cache():
+    return caches[getattr(settings, 'TASK_CACHE_ALIAS', 'default')]
+
+
+def project_scope(project_id):
+    return f'project:{project_id}'
+
+
+def task_scope(task_id):
+    return f'task:{task_id}'
+
+
+def list_scopes(project_id=None):
+    """The scopes a list of all tasks, or of one project's, depends on."""
+    scope = LIST_SCOPE if project_id is None else project_scope(project_id)
+    return [scope, STATUS_SCOPE, PROFILES_SCOPE]
+
+
+def detail_scopes(task_id):
+    return [task_scope(task_id), STATUS_SCOPE, PROFILES_SCOPE]
+
+
+def get_versions(scopes):
+    """
+    Returns the current counter for each scope. Counters that are missing
+    (never set, or evicted) start from the current time so that entries
+    written under an older counter can't be served again.
+    """
+    cache = get_cache()
+    keys = {VERSION_KEY.format(scope=scope): scope for scope in scopes}
+    found = cache.get_many(keys)
+
+    versions = {}
+    for key, scope in keys.items():
+        if key not in found:
+            cache.add(key, time.time_ns(), None)
+            found[key] = cache.get(key)
+        versions[scope] = found[key]
+    return versions
+
+
+async def aget_versions(scopes):
+    cache = get_cache()
+    keys = {VERSION_KEY.format(scope=scope): scope for scope in scopes}
+    found = await cache.aget_many(keys)
+
+    versions = {}
+    for key, scope in keys.items():
+        if key not in found:
+            await cache.aadd(key, time.time_ns(), None)
+            found[key] = await cache.aget(key)
+        versions[scope] = found[key]
+    return versions
+
+
+def get_last_modified(scopes):
+    """
+    The time of the latest bump of any of ``scopes``, as a Unix timestamp.
+    A scope with no recorded bump (never bumped, or evicted) counts from
+    now, which can only make a client revalidate sooner.
+    """
+    cache = get_cache()
+    keys = [MODIFIED_KEY.format(scope=scope) for scope in scopes]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, time.time(), None)
+            found[key] = cache.get(key)
+    return max(found.values())
+
+
+async def aget_last_modified(scopes):
+    cache = get_cache()
+    keys = [MODIFIED_KEY.format(scope=scope) for scope in scopes]
+    found = await cache.aget_many(keys)
+    for key in keys:
+        if key not in found:
+            await cache.aadd(key, time.time(), None)
+            found[key] = await cache.aget(key)
+    return max(found.values())
+
+
+def bump(*scopes):
+    """
+    Moves the counter of each scope now, so the writing transaction never
+    reads its own stale entries, and again when that transaction commits:
+    readers in between still see the old rows and may have cached them
+    under the first new counter.
+    """
+    increment(scopes)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(partial(increment, scopes))
+
+
+def increment(scopes):
+    cache = get_cache()
+    for scope in scopes:
+        key = VERSION_KEY.format(scope=scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+    now = time.time()
+    cache.set_many({MODIFIED_KEY.format(scope=scope): now for scope in scopes}, None)
+    if REPLICA_ALIAS in connections.databases:
+        # The replica may lag this write by up to REPLICA_PIN_SECONDS.
+        cache.set_many({RECENT_KEY.format(scope=scope): True for scope in scopes}, settings.REPLICA_PIN_SECONDS)
+
+
+def lagging(scopes):
+    """
+    Whether reads in this request go to the replica and one of ``scopes``
+    was bumped too recently for the replica to be sure to have the write.
+    """
+    if not replica_reads.get():
+        return False
+    return bool(get_cache().get_many([RECENT_KEY.format(scope=scope) for scope in scopes]))
+
+
+async def alagging(scopes):
+    if not replica_reads.get():
+        return False
+    return bool(await get_cache().aget_many([RECENT_KEY.format(scope=scope) for scope in scopes]))
+
+
+def bump_tasks(task_ids=(), project_ids=()):
+    bump(
+        LIST_SCOPE,
+        *(task_scope(task_id) for task_id in set(task_ids)),
+        *(project_scope(project_id) for project_id in set(project_ids) if project_id is not None),
+    )
+
+
+def record(outcome):
+    cache = get_cache()
+    key = STATS_KEY.format(outcome=outcome)
+    if not cache.add(key, 1, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+
+async def arecord(outcome):
+    cache = get_cache()
+    key = STATS_KEY.format(outcome=outcome)
+    if not await cache.aadd(key, 1, None):
+        try:
+            await cache.aincr(key)
+        except ValueError:
+            await cache.aset(key, 1, None)
+
+
+def get_stats():
+    cache = get_cache()
+    return {
+        outcome: cache.get(STATS_KEY.format(outcome=outcome), 0)
+        for outcome in ('hits', 'misses')
+    }
+
+
+def reset_stats():
+    get_cache().delete_many([STATS_KEY.format(outcome=outcome) for outcome in ('hits', 'misses')])
+
+
+def make_key(kind, request, scopes, **extra):
+    """
+    The response cache key for ``request`` under the current versions of
+    ``scopes``, or None when the response must not be cached: without a
+    shared cache (``SHARED_CACHE``) a bump in one process never reaches the
+    counters of the others, and a replica read right after a bump may
+    return the rows from before the write, which would then be stored
+    under the new version.
+    """
+    if not settings.SHARED_CACHE or lagging(scopes):
+        return None
+    return build_key(kind, request, extra, get_versions(scopes))
+
+
+async def amake_key(kind, request, scopes, **extra):
+    if not settings.SHARED_CACHE or await alagging(scopes):
+        return None
+    return build_key(kind, request, extra, await aget_versions(scopes))
+
+
+def build_key(kind, request, extra, versions):
+    params = sorted((key, sorted(values)) for key, values in request.query_params.lists())
+    # Bodies carry absolute next/comments_next links, so they are kept per
+    # scheme and host. Entries built from the replica may lag; keep them
+    # apart from primary ones.
+    payload = json.dumps(
+        [request.user.pk, request.build_absolute_uri('/'), params, extra, versions, replica_reads.get()],
+        sort_keys=True, default=str,
+    )
+    digest = hashlib.sha256(payload.encode()).hexdigest()
+    return RESPONSE_KEY.format(kind=kind, digest=digest)
+
+
+def cached_response(key, render):
+    """
+    Serves ``key`` from the cache, or calls ``render`` and stores the
+    resulting data when it is a 200. Stale entries are never deleted; a
+    version bump just makes readers compute a different key. A None key
+    (see ``make_key``) renders without the cache.
+    """
+    if key is None:
+        response = render()
+        response['X-Cache'] = 'BYPASS'
+        return response
+
+    cache = get_cache()
+    data = cache.get(key)
+    if data is not None:
+        record('hits')
+        response = Response(data)
+        response['X-Cache'] = 'HIT'
+        return response
+
+    record('misses')
+    response = render()
+    if response.status_code == 200:
+        cache.set(key, response.data, getattr(settings, 'TASK_CACHE_TIMEOUT', 300))
+    response['X-Cache'] = 'MISS'
+    return response
+
+
+async def acached_response(key, render):
+    """Same as ``cached_response``, for an async ``render``."""
+    if key is None:
+        response = await render()
+        response['X-Cache'] = 'BYPASS'
+        return response
+
+    cache = get_cache()
+    data = await cache.aget(key)
+    if data is not None:
+        await arecord('hits')
+        response = Response(data)
+        response['X-Cache'] = 'HIT'
+        return response
+
+    await arecord('misses')
+    response = await render()
+    if response.status_code == 200:
+        await cache.aset(key, response.data, getattr(settings, 'TASK_CACHE_TIMEOUT', 300))
+    response['X-Cache'] = 'MISS'
+    return response
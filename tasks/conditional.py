@@ -0,0 +1,104 @@
+import hashlib
+import json
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from tasks import cache
+
+
+def get_validators(request, queryset, scopes, **extra):
+    """
+    Builds a strong ETag and a Last-Modified timestamp for ``queryset`` from
+    one aggregate query plus the cache version counters of ``scopes``, so
+    nothing has to be serialized to answer a conditional GET. Meant for
+    single objects; lists use ``get_key_validators``.
+    """
+    aggregate = queryset.order_by().aggregate(last_modified=Max('updated_at'), count=Count('id'))
+    return build_validators(request, aggregate, cache.get_versions(scopes), extra)
+
+
+async def aget_validators(request, queryset, scopes, **extra):
+    aggregate = await queryset.order_by().aaggregate(last_modified=Max('updated_at'), count=Count('id'))
+    return build_validators(request, aggregate, await cache.aget_versions(scopes), extra)
+
+
+def build_validators(request, aggregate, versions, extra):
+    last_modified = aggregate['last_modified']
+    if last_modified is None:
+        # Nothing matched: the response is a 404.
+        return None, None
+    params = sorted((key, sorted(values)) for key, values in request.query_params.lists())
+    payload = json.dumps(
+        [request.user.pk, params, extra, aggregate['count'], last_modified, versions],
+        sort_keys=True, default=str,
+    )
+    etag = '"%s"' % hashlib.sha256(payload.encode()).hexdigest()
+    return etag, last_modified.timestamp()
+
+
+def get_key_validators(key, scopes):
+    """
+    A strong ETag derived from a response cache key, which already covers
+    the user, the query parameters and the versions of every scope the
+    response depends on, and a Last-Modified timestamp from the latest bump
+    of ``scopes``, so neither costs a query. A response that can't be
+    cached (``key`` is None) gets no validators.
+    """
+    if key is None:
+        return None, None
+    return '"%s"' % hashlib.sha256(key.encode()).hexdigest(), cache.get_last_modified(scopes)
+
+
+async def aget_key_validators(key, scopes):
+    if key is None:
+        return None, None
+    return '"%s"' % hashlib.sha256(key.encode()).hexdigest(), await cache.aget_last_modified(scopes)
+
+
+def set_validators(response, etag, last_modified):
+    if etag is not None:
+        response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+def not_modified(request, etag, last_modified):
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(last_modified) if last_modified is not None else None,
+    )
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def respond(request, key, validators, render):
+    """
+    Answers a conditional GET from ``validators``, or serves ``render()``
+    through the response cache under ``key`` with the validators set. The
+    one code path behind the sync task views and their async versions.
+    """
+    response = not_modified(request, *validators)
+    if response is not None:
+        return response
+
+    response = cache.cached_response(key, render)
+    if response.status_code == 200:
+        set_validators(response, *validators)
+    return response
+
+
+async def arespond(request, key, validators, render):
+    """``respond`` for an async ``render``."""
+    response = not_modified(request, *validators)
+    if response is not None:
+        return response
+
+    response = await cache.acached_response(key, render)
+    if response.status_code == 200:
+        set_validators(response, *validators)
+    return response
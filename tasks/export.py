@@ -0,0 +1,119 @@
+import csv
+from itertools import islice
+
+from task_management.renderers import dumps
+from tasks.models import Task
+from tasks.readers import aget_assignees, get_assignees
+
+EXPORT_FIELDS = [
+    'id', 'title', 'description', 'priority', 'priority_display', 'due_date',
+    'status', 'status_name', 'project', 'assignees', 'comments_count',
+    'created_at', 'updated_at',
+]
+
+CHUNK_SIZE = 2000
+
+
+EXPORT_VALUES = (
+    'id', 'title', 'description', 'priority', 'due_date', 'status_id',
+    'status__name', 'project_id', 'comments_count', 'created_at', 'updated_at',
+)
+
+
+def iter_tasks(queryset, chunk_size=CHUNK_SIZE):
+    """
+    Streams flat task rows from ``queryset`` through a server-side cursor,
+    resolving assignee names with one query per chunk.
+    """
+    rows = queryset.prefetch_related(None).values(*EXPORT_VALUES).iterator(chunk_size=chunk_size)
+
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+
+        assignees = get_assignees([row['id'] for row in chunk])
+        for row in chunk:
+            yield export_row(row, assignees)
+
+
+async def aiter_tasks(queryset, chunk_size=CHUNK_SIZE):
+    """``iter_tasks`` on the async ORM, for streaming under ASGI."""
+    chunk = []
+    async for row in queryset.prefetch_related(None).values(*EXPORT_VALUES).aiterator(chunk_size=chunk_size):
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            assignees = await aget_assignees([row['id'] for row in chunk])
+            for row in chunk:
+                yield export_row(row, assignees)
+            chunk = []
+
+    assignees = await aget_assignees([row['id'] for row in chunk]) if chunk else {}
+    for row in chunk:
+        yield export_row(row, assignees)
+
+
+def export_row(row, assignees):
+    return {
+        'id': row['id'],
+        'title': row['title'],
+        'description': row['description'],
+        'priority': row['priority'],
+        'priority_display': Task.PRIORITY_CHOICES.get(row['priority']),
+        'due_date': row['due_date'],
+        'status': row['status_id'],
+        'status_name': row['status__name'],
+        'project': row['project_id'],
+        'assignees': [full_name for _, full_name in assignees.get(row['id'], [])],
+        'comments_count': row['comments_count'],
+        'created_at': row['created_at'],
+        'updated_at': row['updated_at'],
+    }
+
+
+def ndjson_line(row):
+    return dumps(row) + b'\n'
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+def csv_line(values):
+    return csv.writer(Echo()).writerow([
+        value.isoformat() if hasattr(value, 'isoformat') else value
+        for value in values
+    ])
+
+
+def csv_header():
+    return csv_line(EXPORT_FIELDS)
+
+
+def csv_row(row):
+    row['assignees'] = '; '.join(row['assignees'])
+    return csv_line(row[field] for field in EXPORT_FIELDS)
+
+
+# output -> (content type, header line or None, row -> line)
+EXPORT_FORMATS = {
+    'ndjson': ('application/x-ndjson', None, ndjson_line),
+    'csv': ('text/csv', csv_header, csv_row),
+}
+
+
+def render_lines(output, rows):
+    _, header, line = EXPORT_FORMATS[output]
+    if header is not None:
+        yield header()
+    for row in rows:
+        yield line(row)
+
+
+async def arender_lines(output, rows):
+    _, header, line = EXPORT_FORMATS[output]
+    if header is not None:
+        yield header()
+    async for row in rows:
+        yield line(row)
@@ -0,0 +1,37 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connections
+from django.db.models import F
+from rest_framework import filters
+
+SEARCH_CONFIG = 'english'
+
+
+class TaskSearchFilter(filters.SearchFilter):
+    """
+    Full-text search over the maintained ``Task.search_vector`` on
+    PostgreSQL; other databases keep the icontains lookups over
+    ``search_fields``.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if connections[queryset.db].vendor != 'postgresql':
+            return super().filter_queryset(request, queryset, view)
+
+        search_terms = self.get_search_terms(request)
+        if not search_terms:
+            return queryset
+
+        query = SearchQuery(' '.join(search_terms), config=SEARCH_CONFIG, search_type='websearch')
+        return queryset.filter(search_vector=query).annotate(
+            search_rank=SearchRank(F('search_vector'), query),
+        )
+
+
+class TaskOrderingFilter(filters.OrderingFilter):
+    """Orders ranked search results by relevance unless ?ordering is given."""
+
+    def get_ordering(self, request, queryset, view):
+        params = request.query_params.get(self.ordering_param)
+        if not params and 'search_rank' in queryset.query.annotations:
+            return ['-search_rank', '-id']
+        return super().get_ordering(request, queryset, view)
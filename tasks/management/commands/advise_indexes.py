@@ -0,0 +1,183 @@
+import datetime
+import itertools
+import re
+import time
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.models import Count
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from tasks.benchmarks import seed_tasks
+from tasks.models import Status, Task
+from tasks.views import TaskFilter, TaskViewSet
+
+POSTGRES_SEQ_SCAN = re.compile(r'Seq Scan on (\w+)')
+POSTGRES_SORT = re.compile(r'^\s*(?:->\s*)?(?:Incremental )?Sort\b(?! Key| Method)', re.MULTILINE)
+SQLITE_SEQ_SCAN = re.compile(r'\bSCAN (\w+)')
+SQLITE_SORT = re.compile(r'USE TEMP B-TREE FOR (?:RIGHT PART OF )?ORDER BY')
+
+EQUALITY_ORDER = ['project', 'status', 'priority']
+
+
+class Command(BaseCommand):
+    help = (
+        "Explains every TaskFilter/ordering combination against the current "
+        "database, flags sequential scans and sorts, and proposes indexes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0,
+                            help="Seed at least this many tasks before explaining.")
+        parser.add_argument('--max-filters', type=int, default=2,
+                            help="Largest number of filters combined in one query.")
+        parser.add_argument('--page-size', type=int, default=100)
+        parser.add_argument('--flagged-only', action='store_true',
+                            help="Only print combinations with a scan or sort.")
+
+    def handle(self, *args, **options):
+        if options['seed']:
+            seed_tasks(options['seed'], stdout=self.stdout)
+
+        connection = connections['default']
+        self.vendor = connection.vendor
+        dimensions = self.get_dimensions()
+        orderings = [None] + [
+            prefix + field for field in TaskViewSet.ordering_fields for prefix in ('', '-')
+        ]
+
+        proposals = defaultdict(list)
+        checked = 0
+        for size in range(options['max_filters'] + 1):
+            for combo in itertools.combinations(dimensions, size):
+                if len({dimension['field'] for dimension in combo}) < size:
+                    continue
+                for ordering in orderings:
+                    checked += 1
+                    label, flags, elapsed = self.explain(combo, ordering, options['page_size'])
+                    if flags:
+                        proposal = self.propose(combo, ordering)
+                        if proposal:
+                            proposals[proposal].append(label)
+                    if flags or not options['flagged_only']:
+                        status = ', '.join(flags) if flags else 'ok'
+                        self.stdout.write(f"{elapsed:8.2f} ms  {label}  [{status}]")
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"\n{checked} combinations explained on {self.vendor}; {len(proposals)} index proposal(s)"
+        ))
+        for (fields, condition), labels in sorted(proposals.items(), key=lambda item: -len(item[1])):
+            name = '_'.join(['task'] + [field.replace('_', '')[:6] for field in fields if field != 'id'] + ['idx'])
+            condition_arg = f", condition=Q({condition}=False)" if condition else ''
+            self.stdout.write(
+                f"models.Index(fields={list(fields)!r}, name={name[:30]!r}{condition_arg})"
+                f"  # serves {len(labels)} flagged quer{'y' if len(labels) == 1 else 'ies'}"
+            )
+
+    def get_dimensions(self):
+        today = datetime.date.today()
+        status_id = Status.objects.values_list('id', flat=True).first()
+        project_id = Task.objects.exclude(project=None).values_list('project_id', flat=True).first()
+        profile_ids = list(
+            Task.assignees.through.objects.values('profile_id').annotate(n=Count('id'))
+            .order_by('-n').values_list('profile_id', flat=True)[:2]
+        )
+        samples = {
+            'status': status_id,
+            'priority': Task.PRIORITY_HIGH,
+            'due_date': {'gte': today - datetime.timedelta(days=7), 'lte': today + datetime.timedelta(days=30)},
+            'created_at': {'gte': today - datetime.timedelta(days=30), 'lte': today},
+            'comments_count': {'gte': 1, 'lte': 50},
+            'assignees': profile_ids,
+        }
+
+        dimensions = []
+        ranges = defaultdict(dict)
+        for name, filter_ in TaskFilter.base_filters.items():
+            field = filter_.field_name
+            if filter_.lookup_expr in ('gte', 'lte'):
+                ranges[field][name] = samples[field][filter_.lookup_expr]
+            elif Task._meta.get_field(field).many_to_many:
+                if profile_ids:
+                    dimensions.append({'label': name, 'field': name, 'kind': 'm2m', 'params': {name: profile_ids}})
+            elif samples.get(field) is not None:
+                dimensions.append({'label': name, 'field': field, 'kind': 'eq', 'params': {name: samples[field]}})
+
+        for field, params in ranges.items():
+            dimensions.append({'label': f'{field} range', 'field': field, 'kind': 'range', 'params': params})
+
+        if profile_ids:
+            dimensions.append({
+                'label': 'profile_id', 'field': 'profile_id', 'kind': 'm2m',
+                'params': {'profile_id': profile_ids[0]},
+            })
+        if project_id is not None:
+            dimensions.append({
+                'label': 'project_pk', 'field': 'project', 'kind': 'eq',
+                'params': {}, 'kwargs': {'project_pk': project_id},
+            })
+        return dimensions
+
+    def build_queryset(self, combo, ordering):
+        params = {}
+        kwargs = {}
+        for dimension in combo:
+            params.update(dimension['params'])
+            kwargs.update(dimension.get('kwargs', {}))
+        if ordering:
+            params['ordering'] = ordering
+
+        request = Request(APIRequestFactory().get('/tasks/', params))
+        view = TaskViewSet(request=request, action='list', kwargs=kwargs, format_kwarg=None)
+        return view.filter_queryset(view.get_queryset())
+
+    def explain(self, combo, ordering, page_size):
+        labels = [dimension['label'] for dimension in combo] or ['no filters']
+        label = ' + '.join(labels) + (f' ordered by {ordering}' if ordering else '')
+        queryset = self.build_queryset(combo, ordering)[:page_size]
+
+        start = time.perf_counter()
+        if self.vendor == 'postgresql':
+            plan = queryset.explain(analyze=True)
+        else:
+            plan = queryset.explain()
+        elapsed = (time.perf_counter() - start) * 1000
+        return label, self.get_flags(plan), elapsed
+
+    def get_flags(self, plan):
+        if self.vendor == 'postgresql':
+            scans, sort = POSTGRES_SEQ_SCAN, POSTGRES_SORT
+        else:
+            scans, sort = SQLITE_SEQ_SCAN, SQLITE_SORT
+
+        flags = [f'seq scan {table}' for table in sorted(set(scans.findall(plan)))]
+        if sort.search(plan):
+            flags.append('sort')
+        return flags
+
+    def propose(self, combo, ordering):
+        """
+        Builds a composite index with equality columns first, then the
+        ordering column, then id as the keyset tiebreaker. A range filter on
+        the nullable ordering column makes it a partial index.
+        """
+        equality = [dimension['field'] for dimension in combo if dimension['kind'] == 'eq']
+        ranges = [dimension['field'] for dimension in combo if dimension['kind'] == 'range']
+        ordering = (ordering or TaskViewSet.ordering[0]).lstrip('-')
+        fields = sorted(set(equality), key=EQUALITY_ORDER.index) + [ordering, 'id']
+
+        condition = None
+        if ordering in ranges and Task._meta.get_field(ordering).null:
+            condition = f'{ordering}__isnull'
+
+        fields = tuple(fields)
+        if any(index[:len(fields)] == fields for index in self.get_existing_indexes()):
+            return None
+        return fields, condition
+
+    def get_existing_indexes(self):
+        indexes = [tuple(index.fields) for index in Task._meta.indexes if not index.condition]
+        indexes += [(field.name,) for field in Task._meta.concrete_fields if field.db_index]
+        return indexes
@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.test import APIClient
+
+from tasks.benchmarks import get_bench_profile
+from tasks.models import Task
+
+
+class Command(BaseCommand):
+    help = "Compares task import throughput of POST /tasks/ one at a time against POST /tasks/bulk/."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=500)
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        profile = get_bench_profile()
+        client = APIClient()
+        client.force_authenticate(profile.user)
+        count = options['count']
+        payloads = [
+            {'title': f'bulk bench {i}', 'priority': 'M', 'assignees': [profile.id]}
+            for i in range(count)
+        ]
+
+        start = time.perf_counter()
+        for payload in payloads:
+            response = client.post('/tasks/', payload, format='json')
+            task_id = response.json()['id']
+            client.post(f'/tasks/{task_id}/assign/', {'profile_ids': payload['assignees']}, format='json')
+        single = time.perf_counter() - start
+        Task.objects.filter(title__startswith='bulk bench ').delete()
+
+        start = time.perf_counter()
+        for offset in range(0, count, options['batch_size']):
+            batch = payloads[offset:offset + options['batch_size']]
+            response = client.post('/tasks/bulk/', {'creates': batch}, format='json')
+            assert response.status_code == 200, response.content
+        bulk = time.perf_counter() - start
+        Task.objects.filter(title__startswith='bulk bench ').delete()
+
+        self.stdout.write(f"one at a time: {count / single:10.1f} tasks/s ({single:.2f} s)")
+        self.stdout.write(f"bulk:          {count / bulk:10.1f} tasks/s ({bulk:.2f} s)")
+        self.stdout.write(self.style.SUCCESS(f"speedup: {single / bulk:.1f}x"))
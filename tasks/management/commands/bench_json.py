@@ -0,0 +1,71 @@
+import datetime
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from phonenumber_field.phonenumber import PhoneNumber
+from rest_framework.renderers import JSONRenderer
+
+from task_management.renderers import FastJSONRenderer, orjson
+from tasks.benchmarks import get_bench_profile, seed_tasks
+from tasks.models import Comment, Task
+from tasks.serializers import TaskDetailSerializer
+
+
+class Command(BaseCommand):
+    help = "Encodes TaskDetailSerializer payloads with stdlib json and the fast renderer and compares them."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=100)
+        parser.add_argument('--comments', type=int, default=20, help="Comments added to each task.")
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write(self.style.WARNING("orjson is not installed; both paths use stdlib json."))
+
+        with transaction.atomic():
+            payload = self.build_payload(options['tasks'], options['comments'])
+            transaction.set_rollback(True)
+
+        stdlib = FastJSONRenderer()
+        fast = FastJSONRenderer()
+        expected = JSONRenderer.render(stdlib, payload)
+        actual = fast.render(payload)
+        if expected != actual:
+            raise CommandError("Fast renderer output differs from stdlib json.")
+        self.stdout.write(self.style.SUCCESS(f"Identical output, {len(actual) / 1024:.0f} KiB per render."))
+
+        for label, render in (
+            ('stdlib json', lambda: JSONRenderer.render(stdlib, payload)),
+            ('fast renderer', lambda: fast.render(payload)),
+        ):
+            start = time.perf_counter()
+            for _ in range(options['repeat']):
+                render()
+            elapsed = (time.perf_counter() - start) / options['repeat']
+            self.stdout.write(f"{label:14} {elapsed * 1000:8.2f} ms/render")
+
+    def build_payload(self, task_count, comment_count):
+        seed_tasks(task_count)
+        profile = get_bench_profile()
+        tasks = list(Task.objects.order_by('id')[:task_count])
+        Comment.objects.bulk_create([
+            Comment(task=task, created_by=profile, text=f"Comment {i} on “{task.title}” ")
+            for task in tasks
+            for i in range(comment_count)
+        ])
+
+        queryset = Task.objects.filter(id__in=[task.id for task in tasks]).prefetch_related(
+            'assignees', 'comments__created_by',
+        ).select_related('status')
+        payload = list(TaskDetailSerializer(queryset, many=True).data)
+        # Raw values, as the values()-based readers and exports hand them over.
+        payload.append({
+            'date': datetime.date.today(),
+            'datetime': timezone.now(),
+            'naive_datetime': datetime.datetime.now(),
+            'phone_no': PhoneNumber.from_string('+14155552671'),
+        })
+        return payload
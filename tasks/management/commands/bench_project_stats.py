@@ -0,0 +1,71 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from tasks.benchmarks import format_summary, get_bench_profile, measure, seed_tasks
+from tasks.models import Project, Task
+from tasks.views import ProjectViewSet
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds tasks and times the project list and detail endpoints, "
+        "reporting how many queries each makes and checking the task counts."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=100000)
+        parser.add_argument('--page-size', type=int, default=20)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        seed_tasks(options['seed'], stdout=self.stdout)
+        user = get_bench_profile().user
+        factory = APIRequestFactory()
+        list_view = ProjectViewSet.as_view({'get': 'list'})
+        detail_view = ProjectViewSet.as_view({'get': 'retrieve'})
+        project = Project.objects.filter(tasks__isnull=False).order_by('id').first()
+        if project is None:
+            raise CommandError("No project has tasks.")
+
+        def get_list():
+            request = factory.get('/projects/', {'page_size': options['page_size']})
+            force_authenticate(request, user=user)
+            return list_view(request).render()
+
+        def get_detail():
+            request = factory.get(f'/projects/{project.id}/')
+            force_authenticate(request, user=user)
+            return detail_view(request, pk=project.id).render()
+
+        self.check_counts(project, get_detail().data['task_counts'])
+        self.stdout.write(self.style.SUCCESS(f"Task counts match for project {project.id}."))
+
+        self.stdout.write(f"{Task.objects.count()} tasks in {Project.objects.count()} projects")
+        for label, fn in (('list', get_list), ('detail', get_detail)):
+            with CaptureQueriesContext(connection) as queries:
+                fn()
+            samples = measure(fn, repeat=options['repeat'])
+            self.stdout.write(f"  {format_summary(label, samples)}, {len(queries)} queries")
+
+    def check_counts(self, project, counts):
+        tasks = Task.objects.filter(project=project)
+        expected = {
+            'total': tasks.count(),
+            'overdue': tasks.filter(due_date__lt=timezone.localdate()).count(),
+            'by_priority': {
+                priority: tasks.filter(priority=priority).count()
+                for priority in Task.PRIORITY_CHOICES
+            },
+            'by_status': [
+                {'status': status_id, 'count': tasks.filter(status_id=status_id).count()}
+                for status_id in sorted(set(tasks.exclude(status=None).values_list('status_id', flat=True)))
+            ],
+        }
+        if tasks.filter(status=None).exists():
+            expected['by_status'].append({'status': None, 'count': tasks.filter(status=None).count()})
+        actual = counts
+        if expected != actual:
+            raise CommandError(f"Task counts differ:\n{expected}\n{actual}")
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from django.db import connections
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from tasks.benchmarks import format_summary, measure, seed_tasks
+from tasks.filters import TaskOrderingFilter, TaskSearchFilter
+from tasks.models import Task
+from tasks.views import TaskViewSet
+
+
+class Command(BaseCommand):
+    help = "Seeds tasks in steps and times the task search query at each size."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='10000,100000,1000000,5000000',
+                            help="Comma-separated task counts to measure at.")
+        parser.add_argument('--terms', default='invoice,payment export,security review',
+                            help="Comma-separated search strings.")
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--page-size', type=int, default=100)
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options['sizes'].split(',')]
+        terms = [term.strip() for term in options['terms'].split(',')]
+        vendor = connections['default'].vendor
+        self.stdout.write(f"Search backend on {vendor}")
+
+        for size in sizes:
+            seed_tasks(size, stdout=self.stdout)
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{size} tasks"))
+            for term in terms:
+                samples = measure(lambda: self.search(term, options['page_size']), repeat=options['repeat'])
+                self.stdout.write("  " + format_summary(f"'{term}'", samples))
+
+    def search(self, term, page_size):
+        request = Request(APIRequestFactory().get('/tasks/', {'search': term}))
+        view = TaskViewSet(request=request, action='list', kwargs={}, format_kwarg=None)
+        queryset = Task.objects.all()
+        queryset = TaskSearchFilter().filter_queryset(request, queryset, view)
+        queryset = TaskOrderingFilter().filter_queryset(request, queryset, view)
+        return list(queryset.values_list('id', flat=True)[:page_size])
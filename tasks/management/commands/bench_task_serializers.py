@@ -0,0 +1,61 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from tasks.benchmarks import seed_tasks
+from tasks.readers import render_task_list, task_list_values
+from tasks.serializers import TaskSerializer
+from tasks.views import TaskViewSet
+
+
+class Command(BaseCommand):
+    help = "Checks the fast task list path against TaskSerializer and reports rows/sec for both."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=1000)
+        parser.add_argument('--page-size', type=int, default=100)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        seed_tasks(options['seed'], stdout=self.stdout)
+        request = Request(APIRequestFactory().get('/tasks/'))
+        view = TaskViewSet(request=request, action='list', kwargs={}, format_kwarg=None)
+        queryset = view.filter_queryset(view.get_queryset())
+        size = options['page_size']
+
+        def serializer_path():
+            return TaskSerializer(list(queryset[:size]), many=True).data
+
+        def fast_path():
+            return render_task_list(task_list_values(queryset)[:size])
+
+        expected = json.loads(json.dumps(serializer_path()))
+        actual = json.loads(json.dumps(fast_path()))
+        if expected != actual:
+            mismatched = next(i for i, (a, b) in enumerate(zip(expected, actual)) if a != b)
+            raise CommandError(
+                f"Output differs at row {mismatched}:\n{expected[mismatched]}\n{actual[mismatched]}"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Output parity OK over {len(actual)} rows."))
+
+        # Statuses come from the process-local map, warm after the parity run.
+        for label, path in (('TaskSerializer', serializer_path), ('fast path', fast_path)):
+            with CaptureQueriesContext(connection) as queries:
+                path()
+            status_queries = [query for query in queries if 'tasks_status' in query['sql']]
+            if status_queries:
+                raise CommandError(f"{label} queried statuses:\n{status_queries[0]['sql']}")
+            self.stdout.write(f"{label:15} {len(queries)} queries per page, none on statuses")
+
+        for label, path in (('TaskSerializer', serializer_path), ('fast path', fast_path)):
+            start = time.perf_counter()
+            for _ in range(options['repeat']):
+                path()
+            elapsed = time.perf_counter() - start
+            rows = size * options['repeat']
+            self.stdout.write(f"{label:15} {rows / elapsed:12.0f} rows/s")
@@ -0,0 +1,127 @@
+import json
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.benchmarks import summarize
+
+DEFAULT_PATHS = ['/tasks/?page_size=50', '/accounts/profiles/']
+
+
+class Command(BaseCommand):
+    help = (
+        "Replays authenticated GETs against a running server at increasing "
+        "concurrency and reports throughput and latency per level. Run it once "
+        "against the WSGI deployment and once against the ASGI one, saving "
+        "the first with --output and passing it to the second with --compare."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+        parser.add_argument('--path', action='append', dest='paths',
+                            help=f"Path to request, repeatable (default: {', '.join(DEFAULT_PATHS)}).")
+        parser.add_argument('--concurrency', default='1,2,4,8,16,32,64',
+                            help="Comma-separated concurrency levels.")
+        parser.add_argument('--requests', type=int, default=200, help="Requests per concurrency level.")
+        parser.add_argument('--token', help="JWT access token.")
+        parser.add_argument('--username', help="Fetch a token from /api/token/ instead of passing --token.")
+        parser.add_argument('--password')
+        parser.add_argument('--bust-cache', action='store_true',
+                            help="Add a unique query parameter to every request so the response cache never hits.")
+        parser.add_argument('--timeout', type=float, default=30)
+        parser.add_argument('--label', default='run')
+        parser.add_argument('--output', help="Write the results to this JSON file.")
+        parser.add_argument('--compare', help="JSON file from an earlier --output run to compare against.")
+
+    def handle(self, *args, **options):
+        base_url = options['base_url'].rstrip('/')
+        token = options['token'] or self.get_token(base_url, options)
+        self.headers = {'Authorization': f'Bearer {token}', 'Accept': 'application/json'}
+        self.timeout = options['timeout']
+
+        paths = options['paths'] or DEFAULT_PATHS
+        levels = [int(level) for level in options['concurrency'].split(',')]
+        urls = [base_url + path for path in paths]
+
+        results = []
+        for concurrency in levels:
+            level = self.run_level(urls, concurrency, options['requests'], options['bust_cache'])
+            results.append(level)
+            self.stdout.write(
+                f"c={concurrency:<4} {level['rps']:8.1f} req/s  p50 {level['p50_ms']:8.2f} ms  "
+                f"p95 {level['p95_ms']:8.2f} ms  mean {level['mean_ms']:8.2f} ms  errors {level['errors']}"
+            )
+
+        run = {'label': options['label'], 'base_url': base_url, 'paths': paths, 'levels': results}
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(run, f, indent=2)
+        if options['compare']:
+            with open(options['compare']) as f:
+                self.compare(json.load(f), run)
+
+    def get_token(self, base_url, options):
+        if not options['username']:
+            raise CommandError("Pass --token, or --username and --password.")
+
+        body = json.dumps({'username': options['username'], 'password': options['password']}).encode()
+        request = urllib.request.Request(
+            f'{base_url}/api/token/', data=body, headers={'Content-Type': 'application/json'},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=options['timeout']) as response:
+                return json.load(response)['access']
+        except urllib.error.HTTPError as exc:
+            raise CommandError(f"Could not obtain a token: HTTP {exc.code}")
+
+    def fetch(self, url):
+        request = urllib.request.Request(url, headers=self.headers)
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response.read()
+                ok = response.status == 200
+        except (urllib.error.URLError, TimeoutError):
+            ok = False
+        return time.perf_counter() - start, ok
+
+    def run_level(self, urls, concurrency, total, bust_cache):
+        targets = []
+        for i in range(total):
+            url = urls[i % len(urls)]
+            if bust_cache:
+                url += ('&' if '?' in url else '?') + urlencode({'_lt': f'{time.time_ns()}-{i}'})
+            targets.append(url)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            outcomes = list(pool.map(self.fetch, targets))
+        elapsed = time.perf_counter() - start
+
+        samples = [duration for duration, ok in outcomes if ok]
+        level = {
+            'concurrency': concurrency,
+            'requests': total,
+            'errors': total - len(samples),
+            'rps': len(samples) / elapsed if elapsed else 0,
+        }
+        level.update(summarize(samples) if samples else {'p50_ms': 0, 'p95_ms': 0, 'mean_ms': 0})
+        return level
+
+    def compare(self, before, after):
+        self.stdout.write(self.style.MIGRATE_HEADING(f"\n{before['label']} vs {after['label']}"))
+        previous = {level['concurrency']: level for level in before['levels']}
+        for level in after['levels']:
+            other = previous.get(level['concurrency'])
+            if other is None:
+                continue
+            self.stdout.write(
+                f"c={level['concurrency']:<4} "
+                f"req/s {other['rps']:8.1f} -> {level['rps']:8.1f}  "
+                f"p95 {other['p95_ms']:8.2f} -> {level['p95_ms']:8.2f} ms  "
+                f"errors {other['errors']} -> {level['errors']}"
+            )
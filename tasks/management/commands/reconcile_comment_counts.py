@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from tasks import cache
+from tasks.models import Comment, Task
+
+
+class Command(BaseCommand):
+    help = "Recomputes Task.comments_count for tasks whose stored counter has drifted."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Report drift without fixing it.")
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        drifted = Task.objects.annotate(
+            actual=self.actual_count(),
+        ).exclude(comments_count=F('actual')).values_list('id', 'project_id', 'comments_count', 'actual')
+
+        batch = []
+        fixed = 0
+        for task_id, project_id, stored, actual in drifted.iterator(chunk_size=options['batch_size']):
+            if options['verbosity'] > 1:
+                self.stdout.write(f"Task {task_id}: stored {stored}, actual {actual}")
+            batch.append((task_id, project_id))
+            if len(batch) >= options['batch_size']:
+                fixed += self.apply(batch, options['dry_run'])
+                batch = []
+        fixed += self.apply(batch, options['dry_run'])
+
+        verb = "would be fixed" if options['dry_run'] else "fixed"
+        self.stdout.write(self.style.SUCCESS(f"{fixed} task(s) {verb}."))
+
+    @staticmethod
+    def actual_count():
+        counts = Comment.objects.filter(task=OuterRef('pk')).order_by().values('task').annotate(
+            count=Count('id'),
+        ).values('count')
+        return Coalesce(Subquery(counts), 0)
+
+    def apply(self, batch, dry_run):
+        if not dry_run and batch:
+            task_ids = [task_id for task_id, _ in batch]
+            with transaction.atomic():
+                # Counted in the UPDATE itself, so comments added or removed
+                # since the drift was found are not lost.
+                Task.objects.filter(pk__in=task_ids).update(comments_count=self.actual_count())
+                cache.bump_tasks(task_ids, [project_id for _, project_id in batch])
+        return len(batch)
@@ -0,0 +1,45 @@
+import sqlite3
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+class Command(BaseCommand):
+    help = (
+        "Copies the SQLite primary into the SQLite replica (SQLITE_REPLICA_PATH), "
+        "standing in for replication when testing replica routing locally. "
+        "With --interval it keeps copying, which simulates replication lag."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=0,
+                            help="Copy again every this many seconds until interrupted.")
+
+    def handle(self, *args, **options):
+        if 'replica' not in connections.databases:
+            raise CommandError("No replica database configured; set SQLITE_REPLICA_PATH.")
+        for alias in ('default', 'replica'):
+            if connections[alias].vendor != 'sqlite':
+                raise CommandError(f"The {alias} database is not SQLite.")
+
+        try:
+            while True:
+                self.copy()
+                if not options['interval']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+
+    def copy(self):
+        start = time.perf_counter()
+        connections['replica'].close()
+        source = sqlite3.connect(connections['default'].settings_dict['NAME'])
+        target = sqlite3.connect(connections['replica'].settings_dict['NAME'])
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+        self.stdout.write(f"Replica synced in {(time.perf_counter() - start) * 1000:.0f} ms")
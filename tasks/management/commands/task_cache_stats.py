@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from tasks import cache
+
+
+class Command(BaseCommand):
+    help = "Prints hit/miss counters for the task list and detail response cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help="Reset the counters after printing.")
+
+    def handle(self, *args, **options):
+        stats = cache.get_stats()
+        total = stats['hits'] + stats['misses']
+        ratio = stats['hits'] / total if total else 0
+        self.stdout.write(f"hits: {stats['hits']}  misses: {stats['misses']}  hit ratio: {ratio:.1%}")
+
+        if options['reset']:
+            cache.reset_stats()
+            self.stdout.write("Counters reset.")
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:46
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+CREATE_SEARCH_SQL = [
+    """
+    CREATE OR REPLACE FUNCTION tasks_task_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('pg_catalog.english', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('pg_catalog.english', coalesce(NEW.description, '')), 'B');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql;
+    """,
+    """
+    CREATE TRIGGER tasks_task_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, description ON tasks_task
+    FOR EACH ROW EXECUTE FUNCTION tasks_task_search_vector_update();
+    """,
+    "UPDATE tasks_task SET title = title;",
+]
+
+SEARCH_INDEX = django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='tasks_task_search_vector_idx')
+
+DROP_SEARCH_SQL = [
+    "DROP TRIGGER IF EXISTS tasks_task_search_vector_trigger ON tasks_task;",
+    "DROP FUNCTION IF EXISTS tasks_task_search_vector_update();",
+]
+
+
+def create_search(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.add_index(apps.get_model('tasks', 'Task'), SEARCH_INDEX)
+    for sql in CREATE_SEARCH_SQL:
+        schema_editor.execute(sql)
+
+
+def drop_search(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for sql in DROP_SEARCH_SQL:
+        schema_editor.execute(sql)
+    schema_editor.remove_index(apps.get_model('tasks', 'Task'), SEARCH_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0006_task_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        # The index is declared on the model, but GIN only exists on PostgreSQL.
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(create_search, drop_search),
+            ],
+            state_operations=[
+                migrations.AddIndex(model_name='task', index=SEARCH_INDEX),
+            ],
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:47
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_comments_count(apps, schema_editor):
+    Task = apps.get_model('tasks', 'Task')
+    Comment = apps.get_model('tasks', 'Comment')
+    counts = Comment.objects.filter(task=OuterRef('pk')).order_by().values('task').annotate(
+        count=Count('id'),
+    ).values('count')
+    Task.objects.update(comments_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_profile_phone_no'),
+        ('tasks', '0007_task_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_comments_count, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['comments_count', 'id'], name='task_comments_count_id_idx'),
+        ),
+    ]
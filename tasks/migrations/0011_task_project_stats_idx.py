@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0010_task_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['project', 'status', 'priority', 'due_date'], name='task_project_stats_idx'),
+        ),
+    ]
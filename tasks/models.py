@@ -1,4 +1,6 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from accounts.models import Profile
 from .validators import hex_color_validator
 
@@ -44,6 +46,7 @@ class Task(models.Model):
 
     title = models.CharField(max_length=255, db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     description = models.TextField(blank=True, null=True)
     priority = models.CharField(max_length=1, choices=PRIORITY_CHOICES, default=PRIORITY_LOW)
     assignees = models.ManyToManyField(
@@ -70,6 +73,22 @@ class Task(models.Model):
         blank=True, 
         null=True,
     )
+    search_vector = SearchVectorField(null=True, editable=False)
+    comments_count = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['due_date', 'id'], name='task_due_date_id_idx'),
+            models.Index(fields=['created_at', 'id'], name='task_created_at_id_idx'),
+            models.Index(fields=['comments_count', 'id'], name='task_comments_count_id_idx'),
+            models.Index(fields=['status', 'created_at', 'id'], name='task_status_created_id_idx'),
+            models.Index(fields=['status', 'due_date', 'id'], name='task_status_due_date_id_idx'),
+            models.Index(fields=['project', 'created_at', 'id'], name='task_project_created_id_idx'),
+            # Covers the grouped project task counts (readers.get_project_task_counts).
+            models.Index(fields=['project', 'status', 'priority', 'due_date'], name='task_project_stats_idx'),
+            # PostgreSQL only: migration 0007 creates it there and skips it elsewhere.
+            GinIndex(fields=['search_vector'], name='tasks_task_search_vector_idx'),
+        ]
 
 class Comment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
@@ -88,6 +107,9 @@ class Comment(models.Model):
     
     class Meta:
         ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['task', 'created_at', 'id'], name='comment_task_created_id_idx'),
+        ]
     
     def __str__(self):
         return f"Comment by {self.created_by} on {self.task}"
@@ -0,0 +1,286 @@
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage, Page
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ParseError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class SetPagination(PageNumberPagination):
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+    
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Async counterpart of ``paginate_queryset``: the count and the page
+        slice run on the async ORM, everything else is unchanged.
+        """
+        self.request = request
+        page_size = self.get_page_size(request)
+        paginator = self.django_paginator_class(queryset, page_size)
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        
+        try:
+            number = paginator.validate_number(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(page_number=page_number, message=str(exc))
+            raise NotFound(msg)
+        
+        bottom = (number - 1) * page_size
+        page = [row async for row in queryset[bottom:bottom + page_size]]
+        self.page = Page(page, number, paginator)
+        return page
+
+
+class KeysetPagination(BasePagination):
+    """
+    Seeks past the last row of the previous page on (ordering field, id)
+    instead of counting and offsetting, so every page costs the same.
+    """
+    cursor_query_param = 'cursor'
+    ordering_query_param = 'ordering'
+    search_query_param = api_settings.SEARCH_PARAM
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    default_ordering = '-created_at'
+    tiebreaker = 'id'
+    invalid_cursor_message = 'Invalid cursor'
+    unranked_search_message = (
+        'Cursor pagination cannot order by search relevance; '
+        'pass ordering, or use page numbers for ranked results.'
+    )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        results = []
+        for segment in self.get_page_querysets(queryset, request, view):
+            results += segment[:self.page_size + 1 - len(results)]
+            if len(results) > self.page_size:
+                break
+        return self.set_page(results)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        results = []
+        for segment in self.get_page_querysets(queryset, request, view):
+            results += [row async for row in segment[:self.page_size + 1 - len(results)]]
+            if len(results) > self.page_size:
+                break
+        return self.set_page(results)
+
+    def get_page_querysets(self, queryset, request, view=None):
+        """
+        Returns the querysets that make up the page, read in order until it
+        is full. Each one is a range of the (ordering field, id) index, so
+        the page costs the same however deep the cursor is. A nullable
+        field is read as two ranges, its values and then its nulls, rather
+        than one ordering that puts nulls last, which the index can't serve
+        in both directions.
+        """
+        # Pages seek on a column, never on the rank, so a search must say
+        # how to order rather than silently lose its relevance order.
+        if (
+            getattr(view, 'search_fields', None)
+            and request.query_params.get(self.search_query_param)
+            and not request.query_params.get(self.ordering_query_param)
+        ):
+            raise ParseError(self.unranked_search_message)
+
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(request, view)
+
+        field = self.ordering.lstrip('-')
+        descending = self.ordering.startswith('-')
+        model_field = queryset.model._meta.get_field(field)
+        value, pk = self.decode_cursor(
+            request, model_field, queryset.model._meta.get_field(self.tiebreaker),
+        ) or (None, None)
+
+        order_by = self.get_order_by(field, descending)
+        after = 'lt' if descending else 'gt'
+        segments = []
+        if pk is None or value is not None:
+            values = queryset.order_by(*order_by)
+            if model_field.null:
+                values = values.filter(**{f'{field}__isnull': False})
+            if pk is not None:
+                values = values.filter(self.get_seek_filter(field, after, value, pk))
+            segments.append(values)
+        if model_field.null:
+            nulls = queryset.filter(**{f'{field}__isnull': True}).order_by(*order_by)
+            if value is None and pk is not None:
+                nulls = nulls.filter(**{f'{self.tiebreaker}__{after}': pk})
+            segments.append(nulls)
+        return segments
+
+    def set_page(self, results):
+        self.has_next = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {
+                    'type': 'string',
+                    'nullable': True,
+                    'format': 'uri',
+                },
+                'results': schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, request, view):
+        allowed = getattr(view, 'ordering_fields', None) or []
+        default = getattr(view, 'ordering', None) or [self.default_ordering]
+        if isinstance(default, str):
+            default = [default]
+
+        param = request.query_params.get(self.ordering_query_param)
+        if param:
+            term = param.split(',')[0].strip()
+            if term.lstrip('-') in allowed:
+                return term
+        return default[0]
+
+    def get_order_by(self, field, descending):
+        prefix = '-' if descending else ''
+        return [prefix + field, prefix + self.tiebreaker]
+
+    def get_seek_filter(self, field, after, value, pk):
+        """
+        Rows after (value, pk). The leading bound is implied by the rest,
+        but unlike the OR it is a range the index can start from.
+        """
+        bound = Q(**{f'{field}__{after}e': value})
+        return bound & (
+            Q(**{f'{field}__{after}': value})
+            | Q(**{field: value, f'{self.tiebreaker}__{after}': pk})
+        )
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        field = self.ordering.lstrip('-')
+        cursor = self.encode_cursor(self.ordering, self.get_value(last, field), self.get_value(last, self.tiebreaker))
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    @staticmethod
+    def get_value(row, name):
+        if isinstance(row, dict):
+            return row[name]
+        return getattr(row, name)
+
+    @classmethod
+    def encode_cursor(cls, ordering, value, pk):
+        if hasattr(value, 'isoformat'):
+            value = value.isoformat()
+        payload = json.dumps([ordering, value, pk], separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, request, field, tiebreaker):
+        """
+        Returns the (value, pk) position in the cursor, coerced with the
+        model fields, so a tampered cursor is a 404 rather than a database
+        error.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            ordering, value, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            if ordering != self.ordering or pk is None or (value is None and not field.null):
+                raise ValueError(ordering)
+            if value is not None:
+                value = field.to_python(value)
+            pk = tiebreaker.to_python(pk)
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return value, pk
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'The pagination cursor value.',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Number of results to return per page.',
+                'schema': {'type': 'integer'},
+            },
+        ]
+
+
+class OptionalCursorPagination(BasePagination):
+    """
+    Page-number pagination unless the client opts into keyset pagination
+    with ?pagination=cursor (or follows a cursor link).
+    """
+    mode_query_param = 'pagination'
+    page_class = SetPagination
+    keyset_class = KeysetPagination
+
+    def use_keyset(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == 'cursor'
+            or self.keyset_class.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.paginator = self.keyset_class() if self.use_keyset(request) else self.page_class()
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        self.paginator = self.keyset_class() if self.use_keyset(request) else self.page_class()
+        return await self.paginator.apaginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.page_class().get_paginated_response_schema(schema)
+
+    def get_schema_operation_parameters(self, view):
+        parameters = self.page_class().get_schema_operation_parameters(view)
+        parameters.append({
+            'name': self.mode_query_param,
+            'required': False,
+            'in': 'query',
+            'description': 'Set to "cursor" for keyset pagination.',
+            'schema': {'type': 'string', 'enum': ['cursor']},
+        })
+        parameters.append(self.keyset_class().get_schema_operation_parameters(view)[0])
+        return parameters
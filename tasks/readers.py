@@ -0,0 +1,175 @@
+from django.db.models import Count, F, Q, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+
+from tasks.models import Task
+from tasks.statuses import aget_statuses, get_statuses, status_display
+
+TASK_LIST_VALUES = (
+    'id', 'title', 'description', 'priority', 'due_date', 'status_id',
+    'project_id', 'comments_count',
+    # Not rendered, but keyset pagination reads the ordering column from rows.
+    'created_at',
+)
+
+
+def assignee_rows(task_ids):
+    return Task.assignees.through.objects.filter(task_id__in=task_ids).values_list(
+        'task_id', 'profile_id', 'profile__display_name',
+    ).order_by('task_id', 'profile_id')
+
+
+def get_assignees(task_ids):
+    """Maps each task id to its assignees as (profile id, full name) pairs."""
+    return group_assignees(assignee_rows(task_ids))
+
+
+async def aget_assignees(task_ids):
+    return group_assignees([row async for row in assignee_rows(task_ids)])
+
+
+def group_assignees(rows):
+    assignees = {}
+    for task_id, profile_id, display_name in rows:
+        assignees.setdefault(task_id, []).append((profile_id, display_name))
+    return assignees
+
+
+def task_list_values(queryset):
+    return queryset.prefetch_related(None).values(*TASK_LIST_VALUES)
+
+
+def render_task_list(rows, assignees=None, statuses=None):
+    """
+    Builds the TaskSerializer representation straight from
+    ``task_list_values`` rows, with one extra query for assignees unless
+    they are passed in. Statuses come from the process-local status map.
+    """
+    rows = list(rows)
+    if assignees is None:
+        assignees = get_assignees([row['id'] for row in rows])
+    if statuses is None:
+        statuses = get_statuses({row['status_id'] for row in rows})
+    priorities = Task.PRIORITY_CHOICES
+
+    return [
+        {
+            'id': row['id'],
+            'title': row['title'],
+            'description': row['description'],
+            'priority': row['priority'],
+            'priority_display': priorities.get(row['priority'], row['priority']),
+            'due_date': row['due_date'].isoformat() if row['due_date'] else None,
+            'status': row['status_id'],
+            'status_display': status_display(statuses, row['status_id']),
+            'project': row['project_id'],
+            'assignees': [
+                {'id': profile_id, 'full_name': full_name}
+                for profile_id, full_name in assignees.get(row['id'], [])
+            ],
+            'comments_count': row['comments_count'],
+        }
+        for row in rows
+    ]
+
+
+async def arender_task_list(rows):
+    return render_task_list(
+        rows,
+        await aget_assignees([row['id'] for row in rows]),
+        await aget_statuses({row['status_id'] for row in rows}),
+    )
+
+
+def ordering_expressions(ordering):
+    for term in ordering:
+        if not isinstance(term, str):
+            yield term
+            continue
+        field = F(term.lstrip('-'))
+        yield field.desc() if term.startswith('-') else field.asc()
+
+
+def board_values(queryset, per_column, default_ordering=('-created_at', '-id')):
+    """
+    ``task_list_values`` rows for the first ``per_column`` tasks of each
+    status, in the queryset's ordering, ranked and counted per status by
+    window functions in the same query.
+    """
+    ordering = list(queryset.query.order_by) or list(default_ordering)
+    if 'id' not in ordering and '-id' not in ordering:
+        # Break ties on id in the direction of the first term, like KeysetPagination.
+        first = ordering[0]
+        ordering.append('-id' if isinstance(first, str) and first.startswith('-') else 'id')
+
+    # Filters across assignees join a row per match, and the windows would
+    # count those rows; rank each matching task once instead. Annotations the
+    # ordering uses (the search rank) come along.
+    names = {term.lstrip('-') for term in ordering if isinstance(term, str)}
+    tasks = Task.objects.filter(pk__in=queryset.order_by().values('pk')).annotate(**{
+        name: annotation for name, annotation in queryset.query.annotations.items() if name in names
+    })
+
+    return task_list_values(tasks).annotate(
+        column_rank=Window(RowNumber(), partition_by=F('status_id'), order_by=list(ordering_expressions(ordering))),
+        column_total=Window(Count('id'), partition_by=F('status_id')),
+    ).filter(column_rank__lte=per_column).order_by(F('status_id').asc(nulls_last=True), 'column_rank')
+
+
+def render_board(rows, assignees=None):
+    """Groups rendered ``board_values`` rows into one column per status."""
+    rows = list(rows)
+    columns = {}
+    for row, task in zip(rows, render_task_list(rows, assignees)):
+        column = columns.get(row['status_id'])
+        if column is None:
+            column = columns[row['status_id']] = {
+                'status': task['status'],
+                'status_display': task['status_display'],
+                'total': row['column_total'],
+                'tasks': [],
+            }
+        column['tasks'].append(task)
+    return list(columns.values())
+
+
+def empty_task_counts():
+    return {
+        'total': 0,
+        'overdue': 0,
+        'by_status': [],
+        'by_priority': {priority: 0 for priority in Task.PRIORITY_CHOICES},
+    }
+
+
+def get_project_task_counts(project_ids, today=None):
+    """
+    Maps each project id to its task counts (total, overdue, by status and
+    by priority), from one query grouped by project, status and priority.
+    """
+    today = today or timezone.localdate()
+    rows = Task.objects.filter(project_id__in=project_ids).values(
+        'project_id', 'status_id', 'priority',
+    ).annotate(
+        count=Count('id'),
+        overdue=Count('id', filter=Q(due_date__lt=today)),
+    ).order_by('project_id', 'status_id', 'priority')
+
+    counts = {project_id: empty_task_counts() for project_id in project_ids}
+    by_status = {project_id: {} for project_id in project_ids}
+    for row in rows:
+        project_counts = counts[row['project_id']]
+        project_counts['total'] += row['count']
+        project_counts['overdue'] += row['overdue']
+        project_counts['by_priority'][row['priority']] = (
+            project_counts['by_priority'].get(row['priority'], 0) + row['count']
+        )
+        statuses = by_status[row['project_id']]
+        statuses[row['status_id']] = statuses.get(row['status_id'], 0) + row['count']
+
+    for project_id, statuses in by_status.items():
+        counts[project_id]['by_status'] = [
+            {'status': status_id, 'count': count}
+            for status_id, count in sorted(statuses.items(), key=lambda item: (item[0] is None, item[0] or 0))
+        ]
+    return counts
@@ -1,4 +1,14 @@
+from django.conf import settings
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+from drf_spectacular.utils import extend_schema_field
+from drf_spectacular.types import OpenApiTypes
 from rest_framework import serializers
+from tasks import cache
+from tasks.pagination import KeysetPagination
+from tasks.readers import get_project_task_counts
+from tasks.statuses import get_statuses, status_display
 from tasks.models import Status, Task, Project, Comment
 from tasks.validators import hex_color_validator
 from accounts.models import Profile
@@ -10,7 +20,7 @@ class OthersProfileSerializer(serializers.ModelSerializer):
         fields = ['id', 'full_name']
 
     def get_full_name(self, obj):
-        return obj.get_full_name()
+        return obj.display_name
     
 
 class StatusSerializer(serializers.ModelSerializer):
@@ -36,9 +46,8 @@ class CommentSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at','updated_at',]
 
 class TaskSerializer(serializers.ModelSerializer):
-    status_display = StatusSerializer(read_only=True)
+    status_display = serializers.SerializerMethodField()
     assignees = OthersProfileSerializer(many=True,read_only=True)
-    comments_count = serializers.SerializerMethodField()
     priority_display = serializers.CharField(source='get_priority_display', read_only=True)
     
     class Meta:
@@ -46,22 +55,354 @@ class TaskSerializer(serializers.ModelSerializer):
         fields = ['id', 'title', 'description', 'priority', 'priority_display', 'due_date',
                 'status', 'status_display', 'project', 'assignees', 'comments_count']
     
-    def get_comments_count(self, obj):
-        return obj.comments.count()
-
+    @extend_schema_field(StatusSerializer(allow_null=True))
+    def get_status_display(self, obj):
+        # One status map per serialization, from the process-local cache.
+        statuses = self.context.get('statuses')
+        if statuses is None or (obj.status_id is not None and obj.status_id not in statuses):
+            statuses = self.context['statuses'] = get_statuses([obj.status_id])
+        return status_display(statuses, obj.status_id)
+    
     def create(self, validated_data):
         user = self.context['request'].user
         validated_data['created_by'] = user.profile
         return super().create(validated_data)
     
     
+class ProjectSerializer(serializers.ModelSerializer):
+    task_counts = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = Project
+        fields = ['id', 'name', 'description', 'closed', 'created_by', 'created_at', 'task_counts']
+        read_only_fields = ['created_by', 'created_at']
+    
+    @extend_schema_field({
+        'type': 'object',
+        'properties': {
+            'total': {'type': 'integer'},
+            'overdue': {'type': 'integer'},
+            'by_status': {
+                'type': 'array',
+                'items': {
+                    'type': 'object',
+                    'properties': {
+                        'status': {'type': 'integer', 'nullable': True},
+                        'count': {'type': 'integer'},
+                    },
+                },
+            },
+            'by_priority': {
+                'type': 'object',
+                'additionalProperties': {'type': 'integer'},
+            },
+        },
+    })
+    def get_task_counts(self, obj):
+        # The view loads the counts for a whole page at once.
+        counts = self.context.get('task_counts')
+        if counts is None or obj.id not in counts:
+            counts = get_project_task_counts([obj.id])
+        return counts[obj.id]
+    
+    
+def latest_comments(queryset):
+    return queryset.order_by('-created_at', '-id')[:settings.TASK_DETAIL_COMMENTS]
+
+
 class TaskDetailSerializer(TaskSerializer):
-    comments = CommentSerializer(many=True, read_only=True)
+    comments = serializers.SerializerMethodField()
+    comments_next = serializers.SerializerMethodField()
     
     class Meta(TaskSerializer.Meta):
-        fields = TaskSerializer.Meta.fields + ['comments', 'created_by', 'created_at',]
+        fields = TaskSerializer.Meta.fields + ['comments', 'comments_next', 'created_by', 'created_at', 'updated_at',]
+    
+    def get_latest_comments(self, obj):
+        if not hasattr(obj, 'latest_comments'):
+            obj.latest_comments = list(latest_comments(obj.comments.select_related('created_by')))
+        return obj.latest_comments
+    
+    @extend_schema_field(CommentSerializer(many=True))
+    def get_comments(self, obj):
+        latest = self.get_latest_comments(obj)
+        return CommentSerializer(reversed(latest), many=True, context=self.context).data
+    
+    @extend_schema_field(OpenApiTypes.URI)
+    def get_comments_next(self, obj):
+        """Cursor link to the comments older than the embedded ones."""
+        latest = self.get_latest_comments(obj)
+        if obj.comments_count <= len(latest):
+            return None
+        
+        oldest = latest[-1]
+        ordering = '-created_at'
+        cursor = KeysetPagination.encode_cursor(ordering, oldest.created_at, oldest.id)
+        url = reverse('task-comments-list', kwargs={'task_pk': obj.id})
+        url = f"{url}?ordering={ordering}&cursor={cursor}"
+        
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
 
 class TaskAssignSerializer(serializers.Serializer):
     profile_ids = serializers.ListField(
         child=serializers.IntegerField(), required=True
-    )
\ No newline at end of file
+    )
+
+
+BULK_MAX_ITEMS = 1000
+
+
+class TaskBulkCreateSerializer(serializers.Serializer):
+    title = serializers.CharField(max_length=255)
+    description = serializers.CharField(allow_blank=True, allow_null=True, required=False)
+    priority = serializers.ChoiceField(choices=Task.PRIORITY_CHOICES, required=False)
+    due_date = serializers.DateField(allow_null=True, required=False)
+    status = serializers.IntegerField(allow_null=True, required=False)
+    project = serializers.IntegerField(allow_null=True, required=False)
+    assignees = serializers.ListField(child=serializers.IntegerField(), required=False)
+
+
+class TaskBulkUpdateSerializer(TaskBulkCreateSerializer):
+    id = serializers.IntegerField()
+    title = serializers.CharField(max_length=255, required=False)
+
+
+class TaskBulkSerializer(serializers.Serializer):
+    """
+    Validates a batch of task creates, partial updates and deletes together
+    (one existence query per referenced table) and applies them in a single
+    transaction with bulk_create/bulk_update and direct through-table writes.
+    Given a ``project`` in the context (the nested project route), creates go
+    to that project and updates and deletes only reach its tasks.
+    """
+    creates = TaskBulkCreateSerializer(many=True, required=False, max_length=BULK_MAX_ITEMS)
+    updates = TaskBulkUpdateSerializer(many=True, required=False, max_length=BULK_MAX_ITEMS)
+    deletes = serializers.ListField(
+        child=serializers.IntegerField(), required=False, max_length=BULK_MAX_ITEMS,
+    )
+
+    FIELDS = ['title', 'description', 'priority', 'due_date', 'status', 'project']
+
+    def validate(self, data):
+        creates = data.get('creates', [])
+        updates = data.get('updates', [])
+        # The same id twice is one delete.
+        deletes = data['deletes'] = list(dict.fromkeys(data.get('deletes', [])))
+        items = creates + updates
+
+        if not (creates or updates or deletes):
+            raise serializers.ValidationError("Provide at least one create, update or delete.")
+
+        tasks = Task.objects.all()
+        project = self.context.get('project')
+        if project is not None:
+            tasks = tasks.filter(project=project)
+            for item in creates:
+                item['project'] = project.id
+
+        existing = {
+            'status': set(Status.objects.filter(
+                id__in={item['status'] for item in items if item.get('status') is not None},
+            ).values_list('id', flat=True)),
+            'project': set(Project.objects.filter(
+                id__in={item['project'] for item in items if item.get('project') is not None},
+            ).values_list('id', flat=True)),
+            'assignees': set(Profile.objects.filter(
+                id__in={pk for item in items for pk in item.get('assignees', [])},
+            ).values_list('id', flat=True)),
+            'tasks': set(tasks.filter(
+                id__in={item['id'] for item in updates} | set(deletes),
+            ).values_list('id', flat=True)),
+        }
+
+        errors = {}
+        create_errors = [self.check_references(item, existing) for item in creates]
+        if any(create_errors):
+            errors['creates'] = create_errors
+
+        update_errors = []
+        update_ids = set()
+        for item in updates:
+            item_errors = self.check_references(item, existing)
+            if item['id'] not in existing['tasks']:
+                item_errors['id'] = [f"Task {item['id']} does not exist."]
+            elif item['id'] in update_ids:
+                item_errors['id'] = [f"Task {item['id']} is updated more than once."]
+            update_ids.add(item['id'])
+            update_errors.append(item_errors)
+        if any(update_errors):
+            errors['updates'] = update_errors
+
+        missing = sorted(set(deletes) - existing['tasks'])
+        if missing:
+            errors['deletes'] = [f"Tasks {missing} do not exist."]
+        overlap = sorted(update_ids & set(deletes))
+        if overlap:
+            errors.setdefault('deletes', []).append(f"Tasks {overlap} are both updated and deleted.")
+
+        if errors:
+            raise serializers.ValidationError(errors)
+        return data
+
+    def check_references(self, item, existing):
+        errors = {}
+        for field in ('status', 'project'):
+            # Null clears the field; any other id, even 0, must exist.
+            if item.get(field) is not None and item[field] not in existing[field]:
+                errors[field] = [f'Invalid pk "{item[field]}" - object does not exist.']
+        invalid = sorted(set(item.get('assignees', [])) - existing['assignees'])
+        if invalid:
+            errors['assignees'] = [f"Invalid profile ids {invalid}."]
+        return errors
+
+    def get_attrs(self, item):
+        attrs = {}
+        for field in self.FIELDS:
+            if field in item:
+                name = f'{field}_id' if field in ('status', 'project') else field
+                attrs[name] = item[field]
+        return attrs
+
+    def create(self, validated_data):
+        creates = validated_data.get('creates', [])
+        updates = validated_data.get('updates', [])
+        deletes = validated_data.get('deletes', [])
+        profile = self.context['request'].user.profile
+        Through = Task.assignees.through
+        project_ids = set()
+        assignments = []
+
+        with transaction.atomic():
+            created = Task.objects.bulk_create([
+                Task(created_by=profile, **self.get_attrs(item)) for item in creates
+            ])
+            for task, item in zip(created, creates):
+                project_ids.add(task.project_id)
+                assignments += [(task.id, pk) for pk in set(item.get('assignees', []))]
+
+            if updates:
+                tasks = Task.objects.select_for_update().in_bulk([item['id'] for item in updates])
+                fields = {'updated_at'}
+                now = timezone.now()
+                for item in updates:
+                    task = tasks[item['id']]
+                    attrs = self.get_attrs(item)
+                    # Lists of both the old and the new project go stale.
+                    project_ids.add(task.project_id)
+                    for attr, value in attrs.items():
+                        setattr(task, attr, value)
+                    task.updated_at = now
+                    project_ids.add(task.project_id)
+                    fields.update(attrs)
+                Task.objects.bulk_update(tasks.values(), sorted(fields), batch_size=BULK_MAX_ITEMS)
+
+                replaced = [item['id'] for item in updates if 'assignees' in item]
+                Through.objects.filter(task_id__in=replaced).delete()
+                for item in updates:
+                    if 'assignees' in item:
+                        assignments += [(item['id'], pk) for pk in set(item['assignees'])]
+
+            Through.objects.bulk_create(
+                [Through(task_id=task_id, profile_id=profile_id) for task_id, profile_id in assignments],
+                batch_size=BULK_MAX_ITEMS,
+            )
+
+            if deletes:
+                project_ids.update(
+                    Task.objects.filter(id__in=deletes).values_list('project_id', flat=True)
+                )
+                Task.objects.filter(id__in=deletes).delete()
+
+            task_ids = [task.id for task in created] + [item['id'] for item in updates] + deletes
+            transaction.on_commit(lambda: cache.bump_tasks(task_ids, project_ids))
+
+        return {
+            'creates': [{'index': index, 'id': task.id, 'result': 'created'} for index, task in enumerate(created)],
+            'updates': [{'index': index, 'id': item['id'], 'result': 'updated'} for index, item in enumerate(updates)],
+            'deletes': [{'index': index, 'id': task_id, 'result': 'deleted'} for index, task_id in enumerate(deletes)],
+        }
+
+
+BATCH_CHUNK_SIZE = 1000
+
+
+class TaskBatchAssignSerializer(serializers.Serializer):
+    """
+    Adds and removes assignees on every task in ``task_ids`` (or, when it is
+    omitted, every task matched by the view's filters) with chunked
+    set-based writes on the through table.
+    """
+    task_ids = serializers.ListField(child=serializers.IntegerField(), required=False, allow_empty=False)
+    add = serializers.ListField(child=serializers.IntegerField(), required=False, default=list)
+    remove = serializers.ListField(child=serializers.IntegerField(), required=False, default=list)
+
+    def validate(self, data):
+        add, remove = set(data['add']), set(data['remove'])
+        if not add and not remove:
+            raise serializers.ValidationError("Provide profile IDs to add or remove.")
+        if add & remove:
+            raise serializers.ValidationError(
+                {"remove": [f"Profiles {sorted(add & remove)} are both added and removed."]}
+            )
+
+        invalid = add - set(Profile.objects.filter(id__in=add).values_list('id', flat=True))
+        if invalid:
+            raise serializers.ValidationError({"add": [f"Invalid profile ids {sorted(invalid)}."]})
+        return data
+
+    def create(self, validated_data):
+        tasks = validated_data['tasks']
+        if 'task_ids' in validated_data:
+            tasks = tasks.filter(id__in=validated_data['task_ids'])
+        add = set(validated_data['add'])
+        remove = set(validated_data['remove'])
+        Through = Task.assignees.through
+
+        added = removed = 0
+        changed = set()
+        with transaction.atomic():
+            # Resolve the matched tasks up front: removing assignees may
+            # change which tasks a filter like ?profile_id= matches.
+            rows = list(tasks.order_by().values_list('id', 'project_id').distinct())
+            project_ids = dict(rows)
+            task_ids = list(project_ids)
+
+            for offset in range(0, len(task_ids), BATCH_CHUNK_SIZE):
+                chunk = task_ids[offset:offset + BATCH_CHUNK_SIZE]
+
+                if remove:
+                    doomed = Through.objects.filter(task_id__in=chunk, profile_id__in=remove)
+                    changed.update(doomed.values_list('task_id', flat=True))
+                    removed += doomed.delete()[0]
+
+                if add:
+                    existing = set(
+                        Through.objects.filter(task_id__in=chunk, profile_id__in=add)
+                        .values_list('task_id', 'profile_id')
+                    )
+                    missing = [
+                        Through(task_id=task_id, profile_id=profile_id)
+                        for task_id in chunk
+                        for profile_id in add
+                        if (task_id, profile_id) not in existing
+                    ]
+                    Through.objects.bulk_create(missing, ignore_conflicts=True)
+                    added += len(missing)
+                    changed.update(row.task_id for row in missing)
+
+            changed = sorted(changed)
+            for offset in range(0, len(changed), BATCH_CHUNK_SIZE):
+                Task.objects.filter(id__in=changed[offset:offset + BATCH_CHUNK_SIZE]).update(
+                    updated_at=timezone.now(),
+                )
+            transaction.on_commit(lambda: cache.bump_tasks(
+                changed, {project_ids[task_id] for task_id in changed},
+            ))
+
+        return {
+            'matched': len(task_ids),
+            'changed': len(changed),
+            'added': added,
+            'removed': removed,
+        }
+
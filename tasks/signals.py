@@ -0,0 +1,95 @@
+from django.contrib.auth import get_user_model
+from django.db.models import F, QuerySet
+from django.db.models.functions import Greatest
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from accounts.models import Profile
+from tasks import cache
+from tasks.models import Comment, Project, Status, Task
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Comment)
+def increment_comments_count(sender, instance, created, **kwargs):
+    if created:
+        Task.objects.filter(pk=instance.task_id).update(
+            comments_count=F('comments_count') + 1,
+            updated_at=timezone.now(),
+        )
+    else:
+        Task.objects.filter(pk=instance.task_id).update(updated_at=timezone.now())
+
+
+def deletes_task(origin):
+    """Whether deleting ``origin`` also deletes the tasks of the comments it cascades to."""
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return model in (Task, Project)
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comments_count(sender, instance, origin=None, **kwargs):
+    if deletes_task(origin):
+        return
+    Task.objects.filter(pk=instance.task_id).update(
+        comments_count=Greatest(F('comments_count') - 1, 0),
+        updated_at=timezone.now(),
+    )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_task(sender, instance, origin=None, **kwargs):
+    # The task's own post_delete invalidates it.
+    if deletes_task(origin):
+        return
+    project_ids = Task.objects.filter(pk=instance.task_id).values_list('project_id', flat=True)
+    cache.bump_tasks([instance.task_id], project_ids)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def invalidate_task(sender, instance, **kwargs):
+    cache.bump_tasks([instance.pk], [instance.project_id])
+
+
+@receiver(m2m_changed, sender=Task.assignees.through)
+def invalidate_assignment(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            Task.objects.filter(pk=instance.pk).update(updated_at=timezone.now())
+            cache.bump_tasks([instance.pk], [instance.project_id])
+        return
+
+    if action == 'pre_clear':
+        instance._cleared_tasks = list(instance.assigned_tasks.values_list('id', 'project_id'))
+        return
+    if action == 'post_clear':
+        rows = instance.__dict__.pop('_cleared_tasks', [])
+    elif action in ('post_add', 'post_remove'):
+        rows = list(Task.objects.filter(pk__in=pk_set).values_list('id', 'project_id'))
+    else:
+        return
+    task_ids = [task_id for task_id, _ in rows]
+    Task.objects.filter(pk__in=task_ids).update(updated_at=timezone.now())
+    cache.bump_tasks(task_ids, [project_id for _, project_id in rows])
+
+
+@receiver(post_save, sender=Status)
+@receiver(post_delete, sender=Status)
+def invalidate_statuses(sender, **kwargs):
+    cache.bump(cache.STATUS_SCOPE)
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def invalidate_profiles(sender, **kwargs):
+    cache.bump(cache.PROFILES_SCOPE)
+
+
+@receiver(post_save, sender=User)
+def invalidate_profile_names(sender, update_fields=None, **kwargs):
+    if update_fields is None or {'first_name', 'last_name'} & set(update_fields):
+        cache.bump(cache.PROFILES_SCOPE)
@@ -0,0 +1,61 @@
+import time
+
+from django.conf import settings
+
+from tasks import cache
+from tasks.models import Status
+
+STATUS_FIELDS = ('id', 'name', 'color')
+
+# (STATUS_SCOPE version it was loaded under, expiry on the monotonic clock,
+#  status id -> StatusSerializer data)
+_loaded = (None, 0, {})
+
+
+def is_current(version, ids):
+    loaded_version, expires, statuses = _loaded
+    return (
+        loaded_version == version and expires > time.monotonic()
+        and all(status_id in statuses for status_id in ids if status_id is not None)
+    )
+
+
+def loaded(version, statuses):
+    return (version, time.monotonic() + settings.STATUS_MAP_TIMEOUT, statuses)
+
+
+def load_statuses():
+    # Read from the primary: a lagging replica would pin stale rows to the new version.
+    return Status.objects.using('default').values(*STATUS_FIELDS).order_by('id')
+
+
+def get_statuses(ids=()):
+    """
+    Maps every status id to its StatusSerializer representation. The map
+    is kept in process memory and reloaded with one query whenever the
+    shared STATUS_SCOPE version moves (any Status write bumps it), one of
+    ``ids`` is missing from it, or STATUS_MAP_TIMEOUT has passed, which
+    bounds staleness when the version lives in per-process memory.
+    """
+    global _loaded
+    version = cache.get_versions([cache.STATUS_SCOPE])[cache.STATUS_SCOPE]
+    if not is_current(version, ids):
+        _loaded = loaded(version, {status['id']: status for status in load_statuses()})
+    return _loaded[2]
+
+
+async def aget_statuses(ids=()):
+    global _loaded
+    version = (await cache.aget_versions([cache.STATUS_SCOPE]))[cache.STATUS_SCOPE]
+    if not is_current(version, ids):
+        _loaded = loaded(version, {status['id']: status async for status in load_statuses()})
+    return _loaded[2]
+
+
+def status_display(statuses, status_id):
+    status = statuses.get(status_id) if status_id is not None else None
+    return dict(status) if status is not None else None
+
+
+def status_choices():
+    return [(status_id, status['name']) for status_id, status in get_statuses().items()]
@@ -1,3 +1,788 @@
-from django.test import TestCase
+import datetime
+import json
+import time
+from io import StringIO
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from asgiref.sync import async_to_sync, sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management import call_command
+from django.conf import settings
+from django.db import connection, connections, transaction
+from django.db.models import F
+from django.test import AsyncClient, AsyncRequestFactory, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory, APITestCase, force_authenticate
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.models import Profile
+from task_management.async_views import async_read
+from . import async_views, cache, statuses
+from .models import Comment, Project, Status, Task
+from .pagination import KeysetPagination
+from .views import TaskViewSet
+
+User = get_user_model()
+
+
+# The replica mirrors default in tests but can't see the uncommitted rows of a
+# TestCase, so only ReplicaPinningTests routes reads to it. The test process
+# is the only one using the local memory cache, so it counts as shared.
+@override_settings(REPLICA_VIEWS=[], SHARED_CACHE=True)
+class TaskAPITestCase(APITestCase):
+
+    def setUp(self):
+        # Responses and scope versions live in the cache, which outlives
+        # the per-test transaction.
+        caches[settings.TASK_CACHE_ALIAS].clear()
+        self.user, self.profile = self.make_user('owner')
+        self.client.force_authenticate(self.user)
+
+    def make_user(self, username):
+        user = User.objects.create_user(
+            username=username, password='pass', first_name=username.title(), last_name='Tester',
+        )
+        return user, Profile.objects.create(user=user)
+
+    def make_task(self, **kwargs):
+        kwargs.setdefault('title', 'Task')
+        kwargs.setdefault('created_by', self.profile)
+        return Task.objects.create(**kwargs)
+
+
+class QueryCountTests(TaskAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.status = Status.objects.create(name='Todo', created_by=self.profile)
+        self.project = Project.objects.create(name='Launch', created_by=self.profile)
+
+    def make_profile(self):
+        # Skips the password hash of make_user.
+        user = User.objects.create(username=f'user{User.objects.count()}')
+        return Profile.objects.create(user=user)
+
+    def grow(self, tasks):
+        """Adds tasks, each with a status, a project, two assignees and two comments."""
+        for index in range(tasks):
+            first, second = self.make_profile(), self.make_profile()
+            task = self.make_task(title=f'Task {index}', status=self.status, project=self.project)
+            task.assignees.add(first, second)
+            Comment.objects.bulk_create([Comment(task=task, created_by=first, text='x')] * 2)
+
+    def queries(self, method, url, data=None):
+        caches[settings.TASK_CACHE_ALIAS].clear()
+        with CaptureQueriesContext(connection) as captured:
+            response = getattr(self.client, method)(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(captured)
+
+    def test_list_and_detail_do_not_grow_with_rows(self):
+        self.grow(2)
+        task = Task.objects.first()
+        before = [
+            self.queries('get', reverse('task-list')),
+            self.queries('get', reverse('task-detail', kwargs={'pk': task.id})),
+        ]
+
+        self.grow(10)
+        task.assignees.add(*Profile.objects.all())
+        Comment.objects.bulk_create([Comment(task=task, created_by=self.profile, text='x')] * 10)
+        self.assertEqual([
+            self.queries('get', reverse('task-list')),
+            self.queries('get', reverse('task-detail', kwargs={'pk': task.id})),
+        ], before)
+
+    def test_assign_and_unassign_do_not_grow_with_profiles(self):
+        self.grow(1)
+        task = Task.objects.get()
+
+        def assign_queries(profiles):
+            ids = [profile.id for profile in profiles]
+            return (
+                self.queries('post', reverse('task-assign', kwargs={'pk': task.id}), {'profile_ids': ids}),
+                self.queries('post', reverse('task-unassign', kwargs={'pk': task.id}), {'profile_ids': ids}),
+            )
+
+        few = assign_queries([self.make_profile()])
+        many = assign_queries([self.make_profile() for _ in range(10)])
+        self.assertEqual(many, few)
+
+
+class BatchAssignTests(TaskAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.other_user, self.other = self.make_user('other')
+        self.high = self.make_task(title='High', priority=Task.PRIORITY_HIGH)
+        self.low = self.make_task(title='Low', priority=Task.PRIORITY_LOW)
+
+    def batch_assign(self, query='', **data):
+        return self.client.post(reverse('task-batch-assign') + query, data, format='json')
+
+    def assigned(self):
+        return set(Task.objects.filter(assignees=self.other).values_list('id', flat=True))
+
+    def test_requires_task_ids_or_filter(self):
+        response = self.batch_assign(add=[self.other.id])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.assigned(), set())
+
+    def test_unknown_parameter_is_not_a_filter(self):
+        response = self.batch_assign('?foo=1', add=[self.other.id])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.assigned(), set())
+
+    def test_blank_filter_is_not_a_filter(self):
+        response = self.batch_assign('?priority=&search=&page_size=10', add=[self.other.id])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.assigned(), set())
+
+    def test_invalid_filter_is_rejected(self):
+        response = self.batch_assign('?priority=X', add=[self.other.id])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.assigned(), set())
+
+    def test_filter_scopes_assignment(self):
+        response = self.batch_assign('?priority=H', add=[self.other.id])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['matched'], 1)
+        self.assertEqual(self.assigned(), {self.high.id})
+
+    def test_search_scopes_assignment(self):
+        response = self.batch_assign('?search=Low', add=[self.other.id])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.assigned(), {self.low.id})
+
+    def test_task_ids_scope_assignment(self):
+        response = self.batch_assign(task_ids=[self.low.id], add=[self.other.id])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.assigned(), {self.low.id})
+
+    def test_nested_project_scopes_assignment(self):
+        project = Project.objects.create(name='Launch', created_by=self.profile)
+        in_project = self.make_task(title='In project', project=project)
+        url = reverse('project-tasks-batch-assign', kwargs={'project_pk': project.id})
+        response = self.client.post(url, {'add': [self.other.id]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.assigned(), {in_project.id})
+
+
+class CacheInvalidationTests(TaskAPITestCase):
+
+    def list_titles(self):
+        response = self.client.get(reverse('task-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response['X-Cache'], [task['title'] for task in response.data['results']]
+
+    def test_list_is_cached_until_a_write(self):
+        self.make_task(title='First')
+        self.assertEqual(self.list_titles(), ('MISS', ['First']))
+        self.assertEqual(self.list_titles(), ('HIT', ['First']))
+
+        response = self.client.post(reverse('task-list'), {'title': 'Second'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.list_titles(), ('MISS', ['Second', 'First']))
+
+    def test_status_rename_reaches_cached_tasks(self):
+        todo = Status.objects.create(name='Todo', created_by=self.profile)
+        task = self.make_task(status=todo)
+        url = reverse('task-detail', kwargs={'pk': task.id})
+        self.assertEqual(self.client.get(url).data['status_display']['name'], 'Todo')
+
+        self.client.patch(reverse('status-detail', kwargs={'pk': todo.id}), {'name': 'Doing'}, format='json')
+        self.assertEqual(self.client.get(url).data['status_display']['name'], 'Doing')
+
+    @override_settings(SHARED_CACHE=False)
+    def test_no_shared_cache_bypasses_the_response_cache(self):
+        self.make_task(title='First')
+        self.assertEqual(self.list_titles(), ('BYPASS', ['First']))
+        self.assertEqual(self.list_titles(), ('BYPASS', ['First']))
+        self.assertNotIn('ETag', self.client.get(reverse('task-list')))
+
+    def test_links_are_cached_per_host(self):
+        for index in range(3):
+            self.make_task(title=f'Task {index}')
+        for host in ('api.example.com', 'internal.example.com'):
+            with self.subTest(host=host):
+                response = self.client.get(reverse('task-list'), {'page_size': 2}, HTTP_HOST=host)
+                self.assertEqual(response['X-Cache'], 'MISS')
+                self.assertTrue(response.data['next'].startswith(f'http://{host}/'))
+
+    def test_bump_repeats_on_commit(self):
+        versions = lambda: cache.get_versions([cache.LIST_SCOPE])[cache.LIST_SCOPE]
+        before = versions()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with transaction.atomic():
+                self.make_task()
+                during = versions()
+            self.assertGreater(during, before)
+        self.assertEqual(len(callbacks), 1)
+        self.assertGreater(versions(), during)
+
+
+class CommentCountTests(TaskAPITestCase):
+
+    def comment(self, task, text='Comment'):
+        return self.client.post(
+            reverse('task-comments-list', kwargs={'task_pk': task.id}), {'text': text}, format='json',
+        )
+
+    def count(self, task):
+        return self.client.get(reverse('task-detail', kwargs={'pk': task.id})).data['comments_count']
+
+    def test_comments_move_the_counter(self):
+        task = self.make_task()
+        self.assertEqual(self.count(task), 0)
+        for index in range(3):
+            self.assertEqual(self.comment(task, f'#{index}').status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.count(task), 3)
+
+        comment = task.comments.first()
+        response = self.client.delete(reverse('task-comments-detail', kwargs={'task_pk': task.id, 'pk': comment.id}))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.count(task), 2)
+
+    def test_deleting_a_task_does_not_touch_it_per_comment(self):
+        def delete_queries(comments):
+            task = self.make_task()
+            Comment.objects.bulk_create([Comment(task=task, created_by=self.profile, text='x')] * comments)
+            with CaptureQueriesContext(connection) as captured:
+                response = self.client.delete(reverse('task-detail', kwargs={'pk': task.id}))
+            self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+            return len(captured)
+
+        self.assertEqual(delete_queries(50), delete_queries(1))
+
+    def test_bulk_delete_removes_the_comments(self):
+        task = self.make_task()
+        Comment.objects.bulk_create([Comment(task=task, created_by=self.profile, text='x')] * 5)
+        response = self.client.post(reverse('task-bulk'), {'deletes': [task.id]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(Comment.objects.exists())
+
+    def test_reconcile_fixes_drift_and_cached_responses(self):
+        task = self.make_task()
+        Comment.objects.bulk_create([Comment(task=task, created_by=self.profile, text='x')] * 2)
+        self.assertEqual(self.count(task), 0)
+
+        call_command('reconcile_comment_counts', stdout=StringIO())
+        self.assertEqual(self.count(task), 2)
+
+
+class ConditionalTests(TaskAPITestCase):
+
+    def test_list_validators_cost_no_query(self):
+        self.make_task()
+        url = reverse('task-list')
+        response = self.client.get(url)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code,
+                status.HTTP_304_NOT_MODIFIED,
+            )
+            self.assertEqual(
+                self.client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code,
+                status.HTTP_304_NOT_MODIFIED,
+            )
+
+    def test_list_last_modified_moves_with_a_write(self):
+        task = self.make_task()
+        # As if the list had last changed a minute ago.
+        caches[settings.TASK_CACHE_ALIAS].set_many(
+            {cache.MODIFIED_KEY.format(scope=scope): time.time() - 60 for scope in cache.list_scopes()}, None,
+        )
+        url = reverse('task-list')
+        last_modified = self.client.get(url)['Last-Modified']
+
+        self.client.patch(reverse('task-detail', kwargs={'pk': task.id}), {'title': 'Renamed'}, format='json')
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['Last-Modified'], last_modified)
+
+    def test_list_etag_changes_with_a_write(self):
+        task = self.make_task()
+        url = reverse('task-list')
+        etag = self.client.get(url)['ETag']
+
+        self.client.patch(reverse('task-detail', kwargs={'pk': task.id}), {'title': 'Renamed'}, format='json')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_list_etag_depends_on_the_page(self):
+        self.make_task()
+        url = reverse('task-list')
+        self.assertNotEqual(self.client.get(url)['ETag'], self.client.get(url, {'page_size': 1})['ETag'])
+
+    def test_detail_validators(self):
+        task = self.make_task()
+        url = reverse('task-detail', kwargs={'pk': task.id})
+        response = self.client.get(url)
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+class ExportTests(TaskAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.task = self.make_task(title='Write docs', priority=Task.PRIORITY_HIGH)
+        self.task.assignees.add(self.profile)
+        self.make_task(title='Other')
+
+    def test_ndjson(self):
+        response = self.client.get(reverse('task-export'), {'priority': Task.PRIORITY_HIGH})
+        self.assertFalse(response.is_async)
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual([(row['id'], row['assignees']) for row in rows], [(self.task.id, ['Owner Tester'])])
+
+    def test_csv(self):
+        response = self.client.get(reverse('task-export'), {'output': 'csv', 'ordering': 'created_at'})
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0].split(',')[:2], ['id', 'title'])
+        self.assertEqual([line.split(',')[1] for line in lines[1:]], ['Write docs', 'Other'])
+
+    async def test_streams_asynchronously_under_asgi(self):
+        token = await sync_to_async(lambda: str(RefreshToken.for_user(self.user).access_token))()
+        response = await AsyncClient().get(
+            reverse('task-export'), {'priority': Task.PRIORITY_HIGH}, headers={'Authorization': f'Bearer {token}'},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # A sync iterator would be read whole before the first byte is sent.
+        self.assertTrue(response.is_async)
+        rows = [json.loads(line) async for line in response.streaming_content]
+        self.assertEqual([(row['id'], row['assignees']) for row in rows], [(self.task.id, ['Owner Tester'])])
+
+
+class AsyncReadTests(TaskAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.task = self.make_task(title='Async', status=Status.objects.create(name='Todo', created_by=self.profile))
+        self.task.assignees.add(self.profile)
+
+    def call(self, handler, actions, path, headers=None, **kwargs):
+        view = async_read(TaskViewSet.as_view(actions), handler)
+        request = AsyncRequestFactory().get(path, headers=headers)
+        force_authenticate(request, self.user)
+        response = async_to_sync(view)(request, **kwargs)
+        return response.render() if hasattr(response, 'render') else response
+
+    def test_list_matches_sync_view(self):
+        url = reverse('task-list') + '?page_size=5'
+        expected = self.client.get(url)
+        response = self.call(async_views.task_list, {'get': 'list'}, url)
+        self.assertEqual(json.loads(response.content), expected.data)
+        self.assertEqual((response['ETag'], response['Last-Modified']), (expected['ETag'], expected['Last-Modified']))
+
+        response = self.call(async_views.task_list, {'get': 'list'}, url, headers={'If-None-Match': expected['ETag']})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_detail_matches_sync_view(self):
+        url = reverse('task-detail', kwargs={'pk': self.task.id})
+        expected = self.client.get(url)
+        response = self.call(async_views.task_detail, {'get': 'retrieve'}, url, pk=str(self.task.id))
+        self.assertEqual(json.loads(response.content), json.loads(expected.content))
+        self.assertEqual(response['ETag'], expected['ETag'])
+
+        missing = self.call(async_views.task_detail, {'get': 'retrieve'}, url, pk=str(self.task.id + 100))
+        self.assertEqual(missing.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn('ETag', missing)
+
+
+class KeysetPaginationTests(TaskAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        today = datetime.date(2026, 1, 1)
+        # Repeated due dates and nulls, so pages split inside ties.
+        for index, offset in enumerate([3, 1, None, 1, 2, None, 3, 1]):
+            due_date = None if offset is None else today + datetime.timedelta(days=offset)
+            self.make_task(title=f'Task {index}', due_date=due_date)
+
+    def walk(self, url):
+        ids, pages = [], 0
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids += [task['id'] for task in response.data['results']]
+            url = response.data['next']
+            pages += 1
+        return ids, pages
+
+    def expected(self, *order_by):
+        return list(Task.objects.order_by(*order_by).values_list('id', flat=True))
+
+    def test_pages_cover_every_task_once(self):
+        ids, pages = self.walk(reverse('task-list') + '?pagination=cursor&page_size=3')
+        self.assertEqual(ids, self.expected('-created_at', '-id'))
+        self.assertEqual(pages, 3)
+
+    def test_page_size_equal_to_total_has_no_next_page(self):
+        ids, pages = self.walk(reverse('task-list') + '?pagination=cursor&page_size=8')
+        self.assertEqual(len(ids), 8)
+        self.assertEqual(pages, 1)
+
+    def test_ties_and_nulls_across_pages(self):
+        ids, _ = self.walk(reverse('task-list') + '?pagination=cursor&page_size=2&ordering=due_date')
+        self.assertEqual(ids, self.expected(F('due_date').asc(nulls_last=True), 'id'))
+
+        ids, _ = self.walk(reverse('task-list') + '?pagination=cursor&page_size=2&ordering=-due_date')
+        self.assertEqual(ids, self.expected(F('due_date').desc(nulls_last=True), '-id'))
+
+    def test_bad_cursors_are_not_found(self):
+        url = reverse('task-list')
+        other_ordering = KeysetPagination.encode_cursor('-due_date', None, 1)
+        for cursor in ['garbage', '', '!!', other_ordering, KeysetPagination.encode_cursor('-created_at', 'x', 'y')]:
+            with self.subTest(cursor=cursor):
+                response = self.client.get(url, {'pagination': 'cursor', 'cursor': cursor or '='})
+                self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_values_must_fit_the_ordering_field(self):
+        url = reverse('task-list')
+        bad = [
+            ('-created_at', 'yesterday', 1),
+            ('-created_at', [2026], 1),
+            ('-created_at', None, 1),
+            ('-created_at', '2026-01-01T00:00:00+00:00', {'id': 1}),
+            ('due_date', '2026-13-01', 1),
+            ('comments_count', 'many', 1),
+        ]
+        for ordering, value, pk in bad:
+            with self.subTest(ordering=ordering, value=value, pk=pk):
+                cursor = KeysetPagination.encode_cursor(ordering, value, pk)
+                response = self.client.get(url, {'pagination': 'cursor', 'ordering': ordering, 'cursor': cursor})
+                self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        cursor = KeysetPagination.encode_cursor('due_date', None, 1)
+        response = self.client.get(url, {'pagination': 'cursor', 'ordering': 'due_date', 'cursor': cursor})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_search_needs_an_explicit_ordering(self):
+        url = reverse('task-list')
+        response = self.client.get(url, {'pagination': 'cursor', 'search': 'task'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        ids, _ = self.walk(url + '?pagination=cursor&page_size=3&search=task&ordering=-created_at')
+        self.assertEqual(ids, self.expected('-created_at', '-id'))
+        response = self.client.get(url, {'search': 'task'})
+        self.assertEqual(response.data['count'], 8)
+
+    def seek_plans(self, ordering, value, pk):
+        cursor = KeysetPagination.encode_cursor(ordering, value, pk)
+        request = Request(APIRequestFactory().get('/', {'ordering': ordering, 'cursor': cursor}))
+        segments = KeysetPagination().get_page_querysets(Task.objects.all(), request, TaskViewSet())
+        if connection.vendor == 'postgresql':
+            # The test tables are tiny; make the planner show the index it would use.
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+        return [segment[:3].explain() for segment in segments]
+
+    def test_seek_is_an_index_range(self):
+        task = Task.objects.filter(due_date__isnull=False).first()
+        seeks = [
+            ('-created_at', task.created_at, task.id),
+            ('created_at', task.created_at, task.id),
+            ('-due_date', task.due_date, task.id),
+            ('due_date', task.due_date, task.id),
+            ('-due_date', None, task.id),
+        ]
+        for ordering, value, pk in seeks:
+            for plan in self.seek_plans(ordering, value, pk):
+                with self.subTest(ordering=ordering, value=value, plan=plan):
+                    if connection.vendor == 'sqlite':
+                        self.assertRegex(plan, r'SEARCH tasks_task USING INDEX task_\w+_id_idx \(\w+[<>=]')
+                        self.assertNotIn('TEMP B-TREE', plan)
+                    elif connection.vendor == 'postgresql':
+                        self.assertRegex(plan, r'Index Cond: \(+(created_at|due_date)')
+                        self.assertNotIn('Sort', plan)
+
+    @override_settings(TASK_DETAIL_COMMENTS=2)
+    def test_comments_page_by_number_and_follow_the_detail_cursor(self):
+        task = self.make_task()
+        comments = [Comment.objects.create(task=task, created_by=self.profile, text=f'#{index}') for index in range(5)]
+
+        response = self.client.get(reverse('task-comments-list', kwargs={'task_pk': task.id}), {'page_size': 2})
+        self.assertEqual(response.data['count'], 5)
+        self.assertEqual([comment['id'] for comment in response.data['results']], [comments[0].id, comments[1].id])
+
+        detail = self.client.get(reverse('task-detail', kwargs={'pk': task.id}))
+        self.assertEqual([comment['id'] for comment in detail.data['comments']], [comments[3].id, comments[4].id])
+        ids, _ = self.walk(detail.data['comments_next'])
+        self.assertEqual(ids, [comments[2].id, comments[1].id, comments[0].id])
+
+
+class BulkTests(TaskAPITestCase):
+
+    def bulk(self, **data):
+        return self.client.post(reverse('task-bulk'), data, format='json')
+
+    def test_applies_creates_updates_and_deletes(self):
+        kept = self.make_task(title='Kept')
+        doomed = self.make_task(title='Doomed')
+        response = self.bulk(
+            creates=[{'title': 'New', 'assignees': [self.profile.id]}],
+            updates=[{'id': kept.id, 'priority': Task.PRIORITY_HIGH}],
+            deletes=[doomed.id],
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            set(Task.objects.values_list('title', 'priority')),
+            {('Kept', Task.PRIORITY_HIGH), ('New', Task.PRIORITY_LOW)},
+        )
+        self.assertEqual(list(Task.objects.get(title='New').assignees.all()), [self.profile])
+
+    def test_invalid_item_rolls_back_the_batch(self):
+        task = self.make_task(title='Kept')
+        response = self.bulk(creates=[{'title': 'New'}], deletes=[task.id, task.id + 100])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('deletes', response.data)
+        self.assertEqual(list(Task.objects.values_list('title', flat=True)), ['Kept'])
+
+    def test_zero_ids_are_checked_and_repeated_deletes_collapse(self):
+        task = self.make_task(title='Doomed')
+        response = self.bulk(creates=[{'title': 'New', 'status': 0, 'project': 0}])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(response.data['creates'][0]), {'status', 'project'})
+
+        response = self.bulk(creates=[{'title': 'New', 'status': None}], deletes=[task.id, task.id])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['deletes'], [{'index': 0, 'id': task.id, 'result': 'deleted'}])
+        self.assertEqual(list(Task.objects.values_list('title', flat=True)), ['New'])
+
+    def test_nested_route_stays_inside_the_project(self):
+        project = Project.objects.create(name='Launch', created_by=self.profile)
+        other = Project.objects.create(name='Other', created_by=self.profile)
+        inside = self.make_task(title='Inside', project=project)
+        outside = self.make_task(title='Outside', project=other)
+        url = reverse('project-tasks-bulk', kwargs={'project_pk': project.id})
+
+        response = self.client.post(url, {
+            'updates': [{'id': outside.id, 'title': 'Moved'}], 'deletes': [outside.id],
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(response.data), {'updates', 'deletes'})
+        self.assertTrue(Task.objects.filter(id=outside.id, title='Outside').exists())
+
+        response = self.client.post(url, {
+            'creates': [{'title': 'New', 'project': other.id}, {'title': 'Loose'}],
+            'deletes': [inside.id],
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            set(Task.objects.values_list('title', 'project')),
+            {('Outside', other.id), ('New', project.id), ('Loose', project.id)},
+        )
+
+
+class BoardTests(TaskAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.todo = Status.objects.create(name='Todo', created_by=self.profile)
+        self.done = Status.objects.create(name='Done', created_by=self.profile)
+        _, self.other = self.make_user('other')
+
+    def board(self, **params):
+        response = self.client.get(reverse('task-board'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {
+            column['status']: (column['total'], [task['title'] for task in column['tasks']])
+            for column in response.data
+        }
+
+    def test_columns_keep_the_list_ordering_up_to_per_column(self):
+        for index in range(3):
+            self.make_task(title=f'Todo {index}', status=self.todo)
+        self.make_task(title='Done 0', status=self.done)
+        self.make_task(title='Loose')
+
+        self.assertEqual(self.board(per_column=2), {
+            self.todo.id: (3, ['Todo 2', 'Todo 1']),
+            self.done.id: (1, ['Done 0']),
+            None: (1, ['Loose']),
+        })
+        self.assertEqual(self.board(per_column=2, ordering='created_at')[self.todo.id], (3, ['Todo 0', 'Todo 1']))
+
+    def test_task_matching_several_assignees_counts_once(self):
+        shared = self.make_task(title='Shared', status=self.todo)
+        shared.assignees.add(self.profile, self.other)
+        self.make_task(title='Mine', status=self.todo).assignees.add(self.profile)
+
+        board = self.board(assignees=[self.profile.id, self.other.id])
+        self.assertEqual(board, {self.todo.id: (2, ['Mine', 'Shared'])})
+
+    def test_query_count_does_not_grow_with_tasks(self):
+        def queries():
+            caches[settings.TASK_CACHE_ALIAS].clear()
+            with CaptureQueriesContext(connection) as captured:
+                self.board()
+            return len(captured)
+
+        self.make_task(status=self.todo).assignees.add(self.profile)
+        few = queries()
+        for index in range(10):
+            task = self.make_task(status=self.done if index % 2 else self.todo)
+            task.assignees.add(self.profile, self.other)
+        self.assertEqual(queries(), few)
+
+
+class ProjectTests(TaskAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.today = timezone.localdate()
+        self.todo = Status.objects.create(name='Todo', created_by=self.profile)
+        self.launch = Project.objects.create(name='Launch', created_by=self.profile)
+        self.archive = Project.objects.create(name='Archive', created_by=self.profile, closed=True)
+        self.empty = Project.objects.create(name='Empty', created_by=self.profile)
+
+        yesterday = self.today - datetime.timedelta(days=1)
+        self.make_task(project=self.launch, status=self.todo, priority=Task.PRIORITY_HIGH, due_date=yesterday)
+        self.make_task(project=self.launch, status=self.todo, due_date=self.today)
+        self.make_task(project=self.launch)
+        self.make_task(project=self.archive, status=self.todo, due_date=yesterday)
+        self.make_task()
+
+    def test_task_counts(self):
+        response = self.client.get(reverse('project-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        counts = {project['name']: project['task_counts'] for project in response.data['results']}
+
+        self.assertEqual(counts['Launch'], {
+            'total': 3,
+            'overdue': 1,
+            'by_status': [{'status': self.todo.id, 'count': 2}, {'status': None, 'count': 1}],
+            'by_priority': {Task.PRIORITY_LOW: 2, Task.PRIORITY_MEDIUM: 0, Task.PRIORITY_HIGH: 1},
+        })
+        self.assertEqual(counts['Archive']['total'], 1)
+        self.assertEqual(counts['Empty'], {
+            'total': 0,
+            'overdue': 0,
+            'by_status': [],
+            'by_priority': {Task.PRIORITY_LOW: 0, Task.PRIORITY_MEDIUM: 0, Task.PRIORITY_HIGH: 0},
+        })
+
+        detail = self.client.get(reverse('project-detail', kwargs={'pk': self.launch.id}))
+        self.assertEqual(detail.data['task_counts'], counts['Launch'])
+
+    def test_list_counts_tasks_in_one_query(self):
+        def list_queries():
+            with CaptureQueriesContext(connection) as captured:
+                self.client.get(reverse('project-list'))
+            return len(captured)
+
+        before = list_queries()
+        for index in range(5):
+            project = Project.objects.create(name=f'Project {index}', created_by=self.profile)
+            self.make_task(project=project, status=self.todo)
+        self.assertEqual(list_queries(), before)
+
+    def test_summary(self):
+        response = self.client.get(reverse('project-summary'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(response.data), [
+            {'closed': False, 'projects': 2, 'total_tasks': 3, 'overdue_tasks': 1},
+            {'closed': True, 'projects': 1, 'total_tasks': 1, 'overdue_tasks': 1},
+        ])
+
+        response = self.client.get(reverse('project-summary'), {'closed': 'true'})
+        self.assertEqual(list(response.data), [{'closed': True, 'projects': 1, 'total_tasks': 1, 'overdue_tasks': 1}])
+
+
+class StatusMapTests(TaskAPITestCase):
+
+    def test_warm_list_does_not_query_statuses(self):
+        todo = Status.objects.create(name='Todo', created_by=self.profile)
+        for index in range(5):
+            self.make_task(title=f'Task {index}', status=todo, priority=Task.PRIORITY_HIGH)
+        self.client.get(reverse('task-list'), {'priority': Task.PRIORITY_LOW})
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('task-list'), {'priority': Task.PRIORITY_HIGH})
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual([task['status_display']['name'] for task in response.data['results']], ['Todo'] * 5)
+        self.assertFalse([query for query in queries if 'tasks_status' in query['sql']])
+        # Count, page and assignees.
+        self.assertEqual(len(queries), 3)
+
+    def test_new_status_reloads_the_map(self):
+        self.client.get(reverse('task-list'))
+        done = Status.objects.create(name='Done', created_by=self.profile)
+        task = self.make_task(status=done)
+        response = self.client.get(reverse('task-detail', kwargs={'pk': task.id}))
+        self.assertEqual(response.data['status_display']['name'], 'Done')
+
+    def test_map_expires_without_a_version_bump(self):
+        todo = Status.objects.create(name='Todo', created_by=self.profile)
+        self.assertEqual(statuses.get_statuses()[todo.id]['name'], 'Todo')
+        # A rename in another process, whose version bump this one can't see.
+        Status.objects.filter(id=todo.id).update(name='Doing')
+        self.assertEqual(statuses.get_statuses()[todo.id]['name'], 'Todo')
+        with mock.patch.object(statuses.time, 'monotonic', return_value=time.monotonic() + settings.STATUS_MAP_TIMEOUT):
+            self.assertEqual(statuses.get_statuses()[todo.id]['name'], 'Doing')
+
+
+@skipUnless('replica' in connections.databases, "needs a replica database, e.g. SQLITE_REPLICA_PATH")
+@override_settings(SHARED_CACHE=True)
+class ReplicaPinningTests(TransactionTestCase):
+    databases = '__all__'
+    client_class = APIClient
+
+    def setUp(self):
+        caches[settings.TASK_CACHE_ALIAS].clear()
+        user = User.objects.create_user(username='reader', password='pass')
+        Profile.objects.create(user=user)
+        self.authorization = f'Bearer {RefreshToken.for_user(user).access_token}'
+        self.client.credentials(HTTP_AUTHORIZATION=self.authorization)
+
+    def read_aliases(self, method, url, data=None):
+        with CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(connections['replica']) as replica:
+            response = getattr(self.client, method)(url, data, format='json')
+        self.assertLess(response.status_code, 400)
+        return bool(primary.captured_queries), bool(replica.captured_queries)
+
+    def test_reads_go_to_the_replica_until_a_write(self):
+        self.assertEqual(self.read_aliases('get', reverse('status-list')), (False, True))
+
+        self.read_aliases('post', reverse('status-list'), {'name': 'Todo', 'color': '#ffffff'})
+        self.assertEqual(self.read_aliases('get', reverse('status-list')), (True, False))
+
+    def test_replica_reads_right_after_a_write_are_not_cached(self):
+        owner = Profile.objects.create(user=User.objects.create_user(username='writer'))
+        Task.objects.create(title='Fresh', created_by=owner)
+        self.assertEqual(self.client.get(reverse('task-list'))['X-Cache'], 'BYPASS')
+        self.assertEqual(self.client.get(reverse('task-list'))['X-Cache'], 'BYPASS')
+
+        # As if REPLICA_PIN_SECONDS had passed.
+        caches[settings.TASK_CACHE_ALIAS].delete_many([
+            cache.RECENT_KEY.format(scope=scope)
+            for scope in (cache.LIST_SCOPE, cache.STATUS_SCOPE, cache.PROFILES_SCOPE)
+        ])
+        self.assertEqual(self.client.get(reverse('task-list'))['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(reverse('task-list'))['X-Cache'], 'HIT')
+
+    def test_async_export_streams_from_the_replica(self):
+        async def export():
+            response = await AsyncClient().get(reverse('task-export'), headers={'Authorization': self.authorization})
+            return response.is_async, [line async for line in response.streaming_content]
+
+        with CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(connections['replica']) as replica:
+            is_async, _ = async_to_sync(export)()
+        self.assertTrue(is_async)
+        self.assertFalse(primary.captured_queries)
+        self.assertTrue([query for query in replica.captured_queries if 'tasks_task' in query['sql']])
+
+    @override_settings(REPLICA_PIN_SECONDS=0)
+    def test_pin_expires(self):
+        self.read_aliases('post', reverse('status-list'), {'name': 'Todo', 'color': '#ffffff'})
+        self.assertEqual(self.read_aliases('get', reverse('status-list')), (False, True))
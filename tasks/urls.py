@@ -1,9 +1,12 @@
 from django.urls import path, include
 from rest_framework_nested import routers
-from tasks.views import TaskViewSet, StatusViewSet, CommentViewSet
+from task_management.async_views import with_async_reads
+from tasks.async_views import READ_HANDLERS
+from tasks.views import TaskViewSet, StatusViewSet, CommentViewSet, ProjectViewSet
 
 router = routers.DefaultRouter()
 router.register(r'statuses', StatusViewSet, basename='status')
+router.register(r'projects', ProjectViewSet, basename='project')
 router.register(r'tasks/(?P<task_pk>\d+)/comments', CommentViewSet, basename='task-comments')
 
 router.register(r'tasks', TaskViewSet, basename='task')
@@ -11,7 +14,11 @@ router.register(r'tasks', TaskViewSet, basename='task')
 tasks_router = routers.NestedSimpleRouter(router, r'tasks', lookup='task')
 tasks_router.register(r'comments', CommentViewSet, basename='standalone-task-comments')
 
+projects_router = routers.NestedSimpleRouter(router, r'projects', lookup='project')
+projects_router.register(r'tasks', TaskViewSet, basename='project-tasks')
+
 urlpatterns = [
-    path('', include(router.urls)),
-    path('', include(tasks_router.urls))
+    path('', include(with_async_reads(router.urls, READ_HANDLERS))),
+    path('', include(with_async_reads(tasks_router.urls, READ_HANDLERS))),
+    path('', include(with_async_reads(projects_router.urls, READ_HANDLERS))),
 ]
\ No newline at end of file
@@ -1,36 +1,54 @@
-from rest_framework import viewsets, status
+from functools import partial
+
+from rest_framework import viewsets, status, filters
 from rest_framework.views import APIView
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from rest_framework import filters
+from django.conf import settings
 from django.shortcuts import get_object_or_404
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.db import transaction
+from django.db.models import Count, Prefetch, Q, QuerySet
+from django.utils import timezone
 
+from django_filters.constants import EMPTY_VALUES
+from django_filters.utils import translate_validation
 from django_filters.rest_framework import DjangoFilterBackend
-from django_filters.rest_framework import FilterSet, DateFilter, ModelMultipleChoiceFilter
-from rest_framework.pagination import PageNumberPagination
+from django_filters.rest_framework import FilterSet, ChoiceFilter, DateFilter, NumberFilter, ModelMultipleChoiceFilter
 
 from .models import Project, Status, Task, Comment
 from .serializers import (
     TaskSerializer, 
     TaskDetailSerializer,
+    TaskBulkSerializer,
+    TaskBatchAssignSerializer,
+    latest_comments,
     StatusSerializer, 
     CommentSerializer,
+    ProjectSerializer,
 )
+from . import cache, conditional
+from .export import EXPORT_FORMATS, aiter_tasks, arender_lines, iter_tasks, render_lines
+from .filters import TaskSearchFilter, TaskOrderingFilter
+from .pagination import OptionalCursorPagination
+from .readers import board_values, get_project_task_counts, render_board, render_task_list, task_list_values
+from .statuses import status_choices
 from accounts.models import Profile
 
-from drf_spectacular.utils import extend_schema, OpenApiExample
-
-class SetPagination(PageNumberPagination):
-    page_size = 100
-    page_size_query_param = "page_size"
-    max_pages_size = 1000
+from drf_spectacular.utils import extend_schema, OpenApiExample, OpenApiParameter
+from drf_spectacular.types import OpenApiTypes
 
 class TaskFilter(FilterSet):
     due_date_min = DateFilter(field_name="due_date", lookup_expr="gte")
     due_date_max = DateFilter(field_name="due_date", lookup_expr="lte")
     created_date_min = DateFilter(field_name="created_at",lookup_expr="gte")
     created_date_max = DateFilter(field_name="created_at",lookup_expr="lte")
+    comments_count_min = NumberFilter(field_name="comments_count", lookup_expr="gte")
+    comments_count_max = NumberFilter(field_name="comments_count", lookup_expr="lte")
+    # Validated against the process-local status map instead of a query.
+    status = ChoiceFilter(choices=status_choices)
 
     assignees = ModelMultipleChoiceFilter(
         field_name="assignees",
@@ -47,16 +65,17 @@ class TaskFilter(FilterSet):
     class Meta:
         model = Task
         fields = {
-            'status': ['exact'],
             'priority': ['exact'],
         }
 
 class TaskViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
-    filter_backends=[DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends=[DjangoFilterBackend, TaskSearchFilter, TaskOrderingFilter]
     filterset_class = TaskFilter
     search_fields = ["title", "description"]
-    ordering_fields = ["due_date", "created_at"]
+    ordering_fields = ["due_date", "created_at", "comments_count"]
+    ordering = ["-created_at", "-id"]
+    pagination_class = OptionalCursorPagination
     
     def get_queryset(self):
         queryset = Task.objects.all()
@@ -69,6 +88,23 @@ class TaskViewSet(viewsets.ModelViewSet):
         if profile_id is not None:
             queryset = queryset.filter(assignees__id=profile_id)
         
+        return self.with_related(queryset)
+    
+    def with_related(self, queryset):
+        # status_display comes from the process-local status map, not a join.
+        queryset = queryset.prefetch_related(
+            Prefetch('assignees', queryset=Profile.objects.order_by('id')),
+        )
+        
+        if self.action in ('retrieve', 'assign', 'unassign'):
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    'comments',
+                    queryset=latest_comments(Comment.objects.select_related('created_by')),
+                    to_attr='latest_comments',
+                ),
+            )
+        
         return queryset
     
     def get_serializer_class(self):
@@ -76,6 +112,47 @@ class TaskViewSet(viewsets.ModelViewSet):
             return TaskDetailSerializer
         return TaskSerializer
     
+    def list(self, request, *args, **kwargs):
+        project_id = self.kwargs.get('project_pk')
+        scopes = cache.list_scopes(project_id)
+        key = cache.make_key('list', request, scopes, project=project_id)
+        return conditional.respond(
+            request, key, conditional.get_key_validators(key, scopes), partial(self.fast_list, request),
+        )
+    
+    def fast_list(self, request):
+        # Read-only fast path: same shape as TaskSerializer, built from values() rows.
+        queryset = task_list_values(self.filter_queryset(self.get_queryset()))
+        
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(render_task_list(page))
+        return Response(render_task_list(queryset))
+    
+    def retrieve(self, request, *args, **kwargs):
+        task_id = self.kwargs['pk']
+        project_id = self.kwargs.get('project_pk')
+        scopes = cache.detail_scopes(task_id)
+        queryset = self.filter_queryset(self.get_queryset()).filter(pk=task_id)
+        validators = conditional.get_validators(request, queryset, scopes, task=task_id, project=project_id)
+        key = cache.make_key('detail', request, scopes, task=task_id, project=project_id)
+        return conditional.respond(
+            request, key, validators, partial(super().retrieve, request, *args, **kwargs),
+        )
+    
+    def perform_create(self, serializer):
+        project_id = self.kwargs.get('project_pk')
+        if project_id is not None:
+            serializer.save(project=get_object_or_404(Project, pk=project_id))
+        else:
+            serializer.save()
+    
+    def perform_update(self, serializer):
+        previous_project_id = serializer.instance.project_id
+        serializer.save()
+        if previous_project_id != serializer.instance.project_id:
+            cache.bump(cache.project_scope(previous_project_id))
+    
     @extend_schema(
         description="Assign users to a task",
         request={
@@ -122,7 +199,7 @@ class TaskViewSet(viewsets.ModelViewSet):
             )
         
         task.assignees.add(*profiles)
-        serializer = TaskDetailSerializer(task)
+        serializer = TaskDetailSerializer(self.get_object(), context=self.get_serializer_context())
         return Response(serializer.data)
     
     @extend_schema(
@@ -164,8 +241,245 @@ class TaskViewSet(viewsets.ModelViewSet):
         
         profiles = Profile.objects.filter(id__in=profile_ids)
         task.assignees.remove(*profiles)
-        serializer = TaskDetailSerializer(task)
+        serializer = TaskDetailSerializer(self.get_object(), context=self.get_serializer_context())
+        return Response(serializer.data)
+
+
+    @extend_schema(
+        description="Create, partially update and delete many tasks in one transaction",
+        request=TaskBulkSerializer,
+        responses={
+            200: {
+                'type': 'object',
+                'properties': {
+                    section: {
+                        'type': 'array',
+                        'items': {
+                            'type': 'object',
+                            'properties': {
+                                'index': {'type': 'integer'},
+                                'id': {'type': 'integer'},
+                                'result': {'type': 'string'},
+                            },
+                        },
+                    }
+                    for section in ('creates', 'updates', 'deletes')
+                },
+            },
+        },
+        examples=[
+            OpenApiExample(
+                name='Valid Bulk Request',
+                value={
+                    'creates': [{'title': 'Write release notes', 'priority': 'M', 'assignees': [1]}],
+                    'updates': [{'id': 7, 'status': 2}],
+                    'deletes': [9],
+                },
+                request_only=True,
+            ),
+        ]
+    )
+    @action(detail=False, methods=['post'])
+    def bulk(self, request, project_pk=None):
+        context = self.get_serializer_context()
+        if project_pk is not None:
+            context['project'] = get_object_or_404(Project, pk=project_pk)
+        serializer = TaskBulkSerializer(data=request.data, context=context)
+        serializer.is_valid(raise_exception=True)
+        return Response(serializer.save())
+    
+    @extend_schema(
+        description=(
+            "Add and remove assignees across many tasks. Targets the tasks in "
+            "task_ids, or every task matched by the usual list filters when "
+            "task_ids is omitted."
+        ),
+        request=TaskBatchAssignSerializer,
+        responses={
+            200: {
+                'type': 'object',
+                'properties': {
+                    'matched': {'type': 'integer'},
+                    'changed': {'type': 'integer'},
+                    'added': {'type': 'integer'},
+                    'removed': {'type': 'integer'},
+                },
+            },
+        },
+        examples=[
+            OpenApiExample(
+                name='Reassign A Profile',
+                description='POST /tasks/batch-assign/?profile_id=4',
+                value={'add': [7], 'remove': [4]},
+                request_only=True,
+            ),
+        ]
+    )
+    @action(detail=False, methods=['post'], url_path='batch-assign')
+    def batch_assign(self, request, project_pk=None):
+        serializer = TaskBatchAssignSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        queryset = self.get_queryset()
+        if 'task_ids' not in serializer.validated_data and not self.has_task_filter(request, queryset):
+            return Response(
+                {"detail": "Provide task_ids or at least one task filter"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        tasks = self.filter_queryset(queryset)
+        return Response(serializer.save(tasks=tasks))
+
+    def has_task_filter(self, request, queryset):
+        # Only parameters that narrow the queryset count: unknown or blank
+        # ones (?foo=1, ?priority=) would otherwise target every task.
+        if self.kwargs.get('project_pk') is not None or request.query_params.get('profile_id'):
+            return True
+        if TaskSearchFilter().get_search_terms(request):
+            return True
+
+        filterset = DjangoFilterBackend().get_filterset(request, queryset, self)
+        if not filterset.is_valid():
+            raise translate_validation(filterset.errors)
+        return any(
+            not value.query.is_empty() if isinstance(value, QuerySet) else value not in EMPTY_VALUES
+            for value in filterset.form.cleaned_data.values()
+        )
+    
+    @extend_schema(
+        description=(
+            "Tasks grouped into one column per status, with the first per_column "
+            "tasks of each column in the list ordering and the column's total. "
+            "Accepts the list filters, search and ordering."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name='per_column',
+                type=OpenApiTypes.INT,
+                default=settings.TASK_BOARD_PER_COLUMN,
+                description=f"At most {settings.TASK_BOARD_MAX_PER_COLUMN}",
+            ),
+        ],
+        responses={
+            200: {
+                'type': 'array',
+                'items': {
+                    'type': 'object',
+                    'properties': {
+                        'status': {'type': 'integer', 'nullable': True},
+                        'status_display': {'type': 'object', 'nullable': True},
+                        'total': {'type': 'integer'},
+                        'tasks': {'type': 'array', 'items': {'type': 'object'}},
+                    },
+                },
+            },
+        },
+    )
+    @action(detail=False, methods=['get'])
+    def board(self, request, project_pk=None):
+        key = cache.make_key('board', request, cache.list_scopes(project_pk), project=project_pk)
+        return cache.cached_response(key, partial(self.fast_board, request))
+    
+    def fast_board(self, request):
+        try:
+            per_column = int(request.query_params['per_column'])
+        except (KeyError, ValueError):
+            per_column = settings.TASK_BOARD_PER_COLUMN
+        if per_column <= 0:
+            per_column = settings.TASK_BOARD_PER_COLUMN
+        per_column = min(per_column, settings.TASK_BOARD_MAX_PER_COLUMN)
+        
+        rows = board_values(self.filter_queryset(self.get_queryset()), per_column, self.ordering)
+        return Response(render_board(rows))
+    
+    @extend_schema(
+        description=(
+            "Stream every task matched by the list filters, search and ordering "
+            "as NDJSON or CSV, with assignee and status names resolved."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name='output',
+                type=OpenApiTypes.STR,
+                enum=tuple(EXPORT_FORMATS),
+                default='ndjson',
+            ),
+        ],
+        responses={200: OpenApiTypes.BINARY},
+    )
+    @action(detail=False, methods=['get'])
+    def export(self, request, project_pk=None):
+        output = request.query_params.get('output', 'ndjson')
+        if output not in EXPORT_FORMATS:
+            return Response(
+                {"detail": f"output must be one of {', '.join(EXPORT_FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        queryset = self.filter_queryset(self.get_queryset())
+        if isinstance(request._request, ASGIRequest):
+            # The ASGI handler buffers a sync iterator whole before sending it.
+            content = arender_lines(output, aiter_tasks(queryset))
+        else:
+            content = render_lines(output, iter_tasks(queryset))
+        response = StreamingHttpResponse(content, content_type=EXPORT_FORMATS[output][0])
+        response['Content-Disposition'] = f'attachment; filename="tasks.{output}"'
+        return response
+
+
+class ProjectViewSet(viewsets.ModelViewSet):
+    permission_classes = [IsAuthenticated]
+    queryset = Project.objects.all()
+    serializer_class = ProjectSerializer
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_fields = ['closed']
+    ordering_fields = ["created_at", "name"]
+    ordering = ["-created_at", "-id"]
+    pagination_class = OptionalCursorPagination
+    
+    def perform_create(self, serializer):
+        serializer.save(created_by=self.request.user.profile)
+    
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        
+        page = self.paginate_queryset(queryset)
+        projects = list(queryset) if page is None else page
+        # Task counts for the whole page come from one grouped query.
+        context = self.get_serializer_context()
+        context['task_counts'] = get_project_task_counts([project.id for project in projects])
+        serializer = self.get_serializer_class()(projects, many=True, context=context)
+        
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
         return Response(serializer.data)
+    
+    @extend_schema(
+        description="Project and task counts, open projects against closed ones",
+        responses={
+            200: {
+                'type': 'array',
+                'items': {
+                    'type': 'object',
+                    'properties': {
+                        'closed': {'type': 'boolean'},
+                        'projects': {'type': 'integer'},
+                        'total_tasks': {'type': 'integer'},
+                        'overdue_tasks': {'type': 'integer'},
+                    },
+                },
+            },
+        },
+    )
+    @action(detail=False, methods=['get'])
+    def summary(self, request):
+        today = timezone.localdate()
+        rows = self.filter_queryset(self.get_queryset()).order_by('closed').values('closed').annotate(
+            projects=Count('id', distinct=True),
+            total_tasks=Count('tasks'),
+            overdue_tasks=Count('tasks', filter=Q(tasks__due_date__lt=today)),
+        )
+        return Response(list(rows))
 
 
 class StatusViewSet(viewsets.ModelViewSet):
@@ -180,11 +494,14 @@ class StatusViewSet(viewsets.ModelViewSet):
 class CommentViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     serializer_class = CommentSerializer
+    ordering_fields = ["created_at"]
+    ordering = ["created_at"]
+    pagination_class = OptionalCursorPagination
     
     def get_queryset(self):
         task_id = self.kwargs.get('task_pk')
         if task_id:
-            return Comment.objects.filter(task_id=task_id)
+            return Comment.objects.filter(task_id=task_id).select_related('created_by')
         return Comment.objects.none()
     
     def create(self, request, *args, **kwargs):
@@ -195,10 +512,11 @@ class CommentViewSet(viewsets.ModelViewSet):
             
             serializer = self.get_serializer(data=request.data)
             if serializer.is_valid():
-                serializer.save(
-                    task=task,
-                    created_by=request.user.profile
-                )
+                with transaction.atomic():
+                    serializer.save(
+                        task=task,
+                        created_by=request.user.profile
+                    )
                 return Response(serializer.data, status=status.HTTP_201_CREATED)
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         
@@ -207,3 +525,7 @@ class CommentViewSet(viewsets.ModelViewSet):
                 {"detail": "Task ID is required in the URL"},
                 status=status.HTTP_400_BAD_REQUEST
             )
+    
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        instance.delete()